@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Asset Bundle - Every game asset packed into one memory-mapped file
+Layout: MAGIC, a little-endian uint32 index length, a JSON index (name -> kind,
+offset, length and format), then the payloads aligned to ALIGN bytes. Images
+are stored pre-scaled as raw RGB/RGBA pixels (sprites already packed into their
+atlases), sounds as raw PCM in the mixer format recorded in the index and fonts
+as their original file bytes. The reader maps the file with mmap, so surfaces
+are built straight from the mapping with pygame.image.frombuffer
+
+Build it with: python asset_bundle.py [-o dpgame.bundle]
+"""
+import argparse
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+
+import pygame
+
+from game_simulation import ASSET_DIR, WIDTH, HEIGHT, ATLAS_SPRITES, AIRPLANE_SPRITES
+from sprite_atlas import ATLAS_WIDTH, PADDING, SpriteAtlas, scaled_size
+
+MAGIC = b"DPBUNDL1"
+VERSION = 1
+
+# Payload alignment; keeps every pixel buffer aligned for the blitters
+ALIGN = 64
+
+# Default bundle location, next to the asset directory
+BUNDLE_PATH = "dpgame.bundle"
+
+# Bundle contents by entry name; images map to (file, target height or "screen")
+BUNDLE_IMAGES = {
+    "start_screen": ("start_screen.png", "screen"),
+    "end_screen": ("end_screen.png", "screen"),
+    "background": ("background.png", HEIGHT),
+}
+BUNDLE_ATLASES = {
+    "atlas": ATLAS_SPRITES,
+    "airplane": AIRPLANE_SPRITES,
+}
+BUNDLE_SOUNDS = {
+    "jump_sound": "jump_sound.wav",
+    "run_sound": "run_sound.wav",
+    "coin_sound": "coin_sound.wav",
+}
+BUNDLE_FILES = {
+    "font": "future-font.TTF",
+}
+
+
+def _source_files():
+    files = [file_name for file_name, _ in BUNDLE_IMAGES.values()]
+    for sprites in BUNDLE_ATLASES.values():
+        files.extend(file_name for file_name, _ in sprites.values())
+    files.extend(BUNDLE_SOUNDS.values())
+    files.extend(BUNDLE_FILES.values())
+    return sorted(set(files))
+
+
+def source_key(asset_dir=ASSET_DIR):
+    """Hash of the mtime and size of every source file, to spot a stale bundle.
+
+    Also covers the size every image is scaled to (sprite heights included, as in
+    sprite_atlas._cache_key()), so editing ATLAS_SPRITES invalidates the bundle too.
+    """
+    entries = []
+    for file_name in _source_files():
+        try:
+            stat = os.stat(os.path.join(asset_dir, file_name))
+            entries.append([file_name, stat.st_mtime_ns, stat.st_size])
+        except OSError:
+            entries.append([file_name, None])
+    images = [[name, file_name, target] for name, (file_name, target) in sorted(BUNDLE_IMAGES.items())]
+    atlases = [[name, [[sprite, file_name, target_height] for sprite, (file_name, target_height) in sorted(sprites.items())]]
+               for name, sprites in sorted(BUNDLE_ATLASES.items())]
+    payload = json.dumps([VERSION, WIDTH, HEIGHT, ATLAS_WIDTH, PADDING, images, atlases, entries]).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()[:16]
+
+
+class AssetBundle:
+    """Read-only view of a bundle file; payloads are slices of one mmap, nothing is copied up front."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            # The mapping stays valid after the file is closed
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        if self._view[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"'{path}' is not an asset bundle")
+        (index_length,) = struct.unpack_from("<I", self._map, len(MAGIC))
+        start = len(MAGIC) + 4
+        index = json.loads(bytes(self._view[start:start + index_length]).decode("utf-8"))
+        if index.get("version") != VERSION:
+            raise ValueError(f"'{path}' has bundle version {index.get('version')}, expected {VERSION}")
+        self.source_key = index["source_key"]
+        self.entries = index["entries"]
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def buffer(self, name):
+        """Zero-copy memoryview of an entry's payload."""
+        entry = self.entries[name]
+        return self._view[entry["offset"]:entry["offset"] + entry["length"]]
+
+    def image(self, name):
+        """Surface backed directly by the mapped pixels (convert it before blitting)."""
+        entry = self.entries[name]
+        return pygame.image.frombuffer(self.buffer(name), tuple(entry["size"]), entry["format"])
+
+    def atlas(self, name):
+        """(surface, rects) of a packed atlas, the same shape as SpriteAtlas.load_raw()."""
+        rects = {sprite: tuple(rect) for sprite, rect in self.entries[name]["rects"].items()}
+        return self.image(name), rects
+
+    def sound(self, name):
+        """pygame Sound from the raw PCM, or None if the mixer runs in another format."""
+        entry = self.entries[name]
+        if pygame.mixer.get_init() != tuple(entry["mixer"]):
+            return None
+        return pygame.mixer.Sound(buffer=self.buffer(name))
+
+    def file(self, name):
+        """File-like object over an entry stored verbatim (e.g. a font)."""
+        return io.BytesIO(self.buffer(name))
+
+
+def open_bundle(path=BUNDLE_PATH, asset_dir=ASSET_DIR):
+    """The bundle at `path`, or None if there is none or it is older than the files in `asset_dir`.
+
+    A kiosk image may ship the bundle without the loose files; the staleness
+    check only applies when `asset_dir` exists.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        bundle = AssetBundle(path)
+    except (OSError, ValueError) as e:
+        print(f"Asset bundle unreadable ({e}), loading loose files")
+        return None
+    if os.path.isdir(asset_dir) and bundle.source_key != source_key(asset_dir):
+        print(f"Asset bundle '{path}' is out of date, loading loose files (rebuild with: python asset_bundle.py)")
+        return None
+    print(f"Loaded asset bundle: {path}")
+    return bundle
+
+
+def _image_entry(surface):
+    has_alpha = bool(surface.get_flags() & pygame.SRCALPHA)
+    pixel_format = "RGBA" if has_alpha else "RGB"
+    return {"kind": "image", "size": list(surface.get_size()), "format": pixel_format}, \
+        pygame.image.tobytes(surface, pixel_format)
+
+
+def _scale_screen(image):
+    # Same result as load_screen() in game_with_assets.py
+    try:
+        return pygame.transform.smoothscale(image, (WIDTH, HEIGHT))
+    except ValueError:
+        return pygame.transform.scale(image, (WIDTH, HEIGHT))
+
+
+def _scale_to_height(image, target_height):
+    # Same result as scale_image() in game_with_assets.py
+    return pygame.transform.scale(image, scaled_size(image.get_size(), target_height))
+
+
+def build_bundle(path=BUNDLE_PATH, asset_dir=ASSET_DIR):
+    """Decode, scale and pack everything in BUNDLE_* from `asset_dir` into `path`.
+
+    Missing source files are skipped; the game falls back to its usual
+    placeholder for those.
+    """
+    payloads = {}
+    for name, (file_name, target) in BUNDLE_IMAGES.items():
+        full_path = os.path.join(asset_dir, file_name)
+        if not os.path.exists(full_path):
+            print(f"Skipping {name}: '{full_path}' not found")
+            continue
+        image = pygame.image.load(full_path)
+        image = _scale_screen(image) if target == "screen" else _scale_to_height(image, target)
+        payloads[name] = _image_entry(image)
+
+    for name, sprites in BUNDLE_ATLASES.items():
+        surface, rects = SpriteAtlas._build(sprites, asset_dir)
+        entry, data = _image_entry(surface)
+        entry["rects"] = rects
+        payloads[name] = entry, data
+
+    pygame.mixer.init()
+    mixer_format = list(pygame.mixer.get_init())
+    for name, file_name in BUNDLE_SOUNDS.items():
+        full_path = os.path.join(asset_dir, file_name)
+        if not os.path.exists(full_path):
+            print(f"Skipping {name}: '{full_path}' not found")
+            continue
+        payloads[name] = {"kind": "sound", "mixer": mixer_format}, pygame.mixer.Sound(full_path).get_raw()
+
+    for name, file_name in BUNDLE_FILES.items():
+        full_path = os.path.join(asset_dir, file_name)
+        if not os.path.exists(full_path):
+            print(f"Skipping {name}: '{full_path}' not found")
+            continue
+        with open(full_path, "rb") as f:
+            payloads[name] = {"kind": "file"}, f.read()
+
+    # Offsets depend on the index length, which depends on the offsets: lay out
+    # the payloads after a generous guess and pad the index up to it
+    entries = {}
+    index_space = 4096 + 512 * len(payloads)
+    offset = len(MAGIC) + 4 + index_space
+    for name, (entry, data) in payloads.items():
+        offset = (offset + ALIGN - 1) // ALIGN * ALIGN
+        entries[name] = dict(entry, offset=offset, length=len(data))
+        offset += len(data)
+    index = json.dumps({"version": VERSION, "source_key": source_key(asset_dir), "entries": entries}).encode("utf-8")
+    if len(index) > index_space:
+        raise ValueError(f"bundle index is {len(index)} bytes, more than the {index_space} reserved")
+
+    with open(path, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(index)) + index)
+        for name, (entry, data) in payloads.items():
+            f.seek(entries[name]["offset"])
+            f.write(data)
+    print(f"Wrote {len(entries)} assets ({offset / 1024:.0f} KiB) to: {path}")
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the memory-mapped asset bundle from dpgame/.")
+    parser.add_argument("-o", "--output", default=BUNDLE_PATH, help="bundle file to write")
+    parser.add_argument("--asset-dir", default=ASSET_DIR, help="directory with the source assets")
+    args = parser.parse_args()
+
+    # Sounds are decoded through the mixer, which doesn't need a real audio device
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    build_bundle(args.output, args.asset_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
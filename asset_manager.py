@@ -0,0 +1,120 @@
+"""
+Asset Manager - Parallel, lazy loading of images and sounds
+Loaders run on a thread pool (decoding and scaling don't need the display);
+audio gets its own background thread. A loader's result is finalized on the
+main thread the first time it is requested (e.g. convert() to the display
+format). Lazy assets only start loading when first needed or prefetched
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Asset:
+    __slots__ = ("name", "loader", "finalize", "lazy", "audio", "future", "value", "done",
+                 "started", "load_seconds", "finalize_seconds")
+
+    def __init__(self, name, loader, finalize, lazy, audio):
+        self.name = name
+        self.loader = loader
+        self.finalize = finalize
+        self.lazy = lazy
+        self.audio = audio
+        self.future = None
+        self.value = None
+        self.done = False
+        self.started = None
+        self.load_seconds = None
+        self.finalize_seconds = 0.0
+
+
+class AssetManager:
+    """Registry of named assets loaded in the background; get() returns the finalized value."""
+
+    def __init__(self, workers=None, progress=None):
+        self.assets = {}
+        self.progress = progress  # Called as progress(loaded, total) while wait() blocks
+        self.executor = ThreadPoolExecutor(max_workers=workers or min(4, os.cpu_count() or 1),
+                                           thread_name_prefix="assets")
+        self.audio_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio")
+        self._lock = threading.Lock()
+
+    def add(self, name, loader, finalize=None, lazy=False, audio=False):
+        """Register `loader()`; non-lazy assets start loading right away."""
+        asset = self.assets[name] = Asset(name, loader, finalize, lazy, audio)
+        if not lazy:
+            self._start(asset)
+        return asset
+
+    def _start(self, asset):
+        with self._lock:
+            if asset.future is not None:
+                return
+            executor = self.audio_executor if asset.audio else self.executor
+            asset.future = executor.submit(self._timed_load, asset)
+
+    @staticmethod
+    def _timed_load(asset):
+        asset.started = time.perf_counter()
+        try:
+            return asset.loader()
+        finally:
+            asset.load_seconds = time.perf_counter() - asset.started
+
+    def prefetch(self, *names):
+        """Start loading lazy assets in the background without waiting for them."""
+        for name in names:
+            self._start(self.assets[name])
+
+    def ready(self, name):
+        asset = self.assets[name]
+        return asset.done or (asset.future is not None and asset.future.done())
+
+    def get(self, name):
+        """Return the asset, loading it now if it is lazy and blocking until it is ready."""
+        asset = self.assets[name]
+        if not asset.done:
+            self._start(asset)
+            value = asset.future.result()
+            if asset.finalize is not None:
+                start = time.perf_counter()
+                value = asset.finalize(value)
+                asset.finalize_seconds = time.perf_counter() - start
+            asset.value = value
+            asset.done = True
+            asset.loader = None  # Let the loader's closure go
+        return asset.value
+
+    def wait(self, names=None, interval=0.02):
+        """Block until `names` (default: every non-lazy asset) are loaded, reporting progress.
+
+        Doesn't finalize or raise loader errors; get() does that per asset.
+        """
+        if names is None:
+            names = [name for name, asset in self.assets.items() if not asset.lazy]
+        total = len(names)
+        while True:
+            loaded = sum(1 for name in names if self.ready(name))
+            if self.progress is not None:
+                self.progress(loaded, total)
+            if loaded == total:
+                break
+            time.sleep(interval)
+
+    def report(self):
+        """Per-asset (name, load seconds, finalize seconds) for the assets loaded so far."""
+        return [
+            (name, asset.load_seconds, asset.finalize_seconds)
+            for name, asset in self.assets.items()
+            if asset.load_seconds is not None
+        ]
+
+    def print_report(self):
+        print("Asset loading times:")
+        for name, load_seconds, finalize_seconds in sorted(self.report(), key=lambda row: -row[1]):
+            print(f"  {name:<20} load {load_seconds * 1000:8.1f} ms   finalize {finalize_seconds * 1000:6.1f} ms")
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.audio_executor.shutdown(wait=False, cancel_futures=True)
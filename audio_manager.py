@@ -0,0 +1,118 @@
+"""
+Audio Manager - Sound effects on reserved channels, plus background music
+Every effect gets its own reserved mixer channels, so a burst of one cue can
+never starve the others, and repeated triggers of a cue within its minimum
+interval are dropped (several triggers in one frame play once). The mixer is
+opened with a small buffer for low latency. Modes: "full" (effects + music from
+the start screen), "light" (effects; music is only opened, and streamed, once a
+game starts) and "off"
+"""
+import pygame
+
+SOUND_MODES = ("full", "light", "off")
+
+# Mixer format; the frequency matches the PCM stored by asset_bundle.py
+MIXER_FREQUENCY = 44100
+MIXER_BUFFER = 256  # Samples per mixer callback, about 6 ms at 44.1 kHz
+
+# cue -> (reserved channels, minimum milliseconds between two plays)
+EFFECTS = {
+    "jump": (1, 0),
+    "run": (1, 120),  # Se dispara en cada paso de la animación y al agacharse
+    "coin": (2, 40),
+}
+
+MUSIC_VOLUME = 0.4
+
+
+def pre_init(buffer=MIXER_BUFFER):
+    """Set the mixer format; must be called before pygame.init()."""
+    pygame.mixer.pre_init(MIXER_FREQUENCY, -16, 2, buffer)
+
+
+class AudioManager:
+    """Plays the simulation's sound cues through per-effect reserved channels."""
+
+    def __init__(self, sounds, mode="full", music_path=None, effects=EFFECTS):
+        if mode not in SOUND_MODES:
+            raise ValueError(f"unknown sound mode {mode!r}, expected one of {SOUND_MODES}")
+        self.mode = mode
+        self.music_path = music_path
+        self.enabled = mode != "off" and pygame.mixer.get_init() is not None
+        self.music_started = False
+        self.played = 0
+        self.dropped = 0
+
+        self._sounds = {}
+        self._channels = {}
+        self._interval = {}
+        self._last_played = {}
+        self._next_channel = {}
+        if not self.enabled:
+            return
+
+        cues = [cue for cue in effects if cue in sounds]
+        reserved = sum(effects[cue][0] for cue in cues)
+        if pygame.mixer.get_num_channels() < reserved:
+            pygame.mixer.set_num_channels(reserved)
+        # Reserved channels are skipped by Sound.play(), so nothing else can steal them
+        pygame.mixer.set_reserved(reserved)
+        index = 0
+        for cue in cues:
+            count, interval = effects[cue]
+            self._sounds[cue] = sounds[cue]
+            self._channels[cue] = [pygame.mixer.Channel(index + i) for i in range(count)]
+            self._interval[cue] = interval
+            self._last_played[cue] = -interval
+            self._next_channel[cue] = 0
+            index += count
+
+    def play(self, cue, now=None):
+        """Play `cue` unless it played less than its minimum interval ago."""
+        sound = self._sounds.get(cue)
+        if sound is None:
+            return False
+        if now is None:
+            now = pygame.time.get_ticks()
+        if now - self._last_played[cue] < self._interval[cue]:
+            self.dropped += 1
+            return False
+        self._last_played[cue] = now
+
+        channels = self._channels[cue]
+        for channel in channels:
+            if not channel.get_busy():
+                break
+        else:
+            # Every channel busy: restart the one used longest ago
+            channel = channels[self._next_channel[cue]]
+            self._next_channel[cue] = (self._next_channel[cue] + 1) % len(channels)
+        channel.play(sound)
+        self.played += 1
+        return True
+
+    def play_cues(self, cues):
+        """Play a frame's cues, each distinct cue at most once."""
+        if not self.enabled or not cues:
+            return
+        now = pygame.time.get_ticks()
+        seen = set()
+        for cue in cues:
+            if cue in seen:
+                self.dropped += 1
+                continue
+            seen.add(cue)
+            self.play(cue, now)
+
+    def start_music(self):
+        """Open and loop the background music (streamed from disk by pygame.mixer.music)."""
+        if not self.enabled or self.music_started or self.music_path is None:
+            return
+        self.music_started = True
+        try:
+            print(f"Loading music from: {self.music_path}")
+            pygame.mixer.music.load(self.music_path)  # Música de fondo
+            pygame.mixer.music.set_volume(MUSIC_VOLUME)  # Ajustar volumen
+            pygame.mixer.music.play(-1)  # Reproducir en bucle
+        except pygame.error as e:
+            print(f"Error loading music: {e}")
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite - Performance numbers for game_with_assets.py
+Runs under the SDL dummy video/audio drivers and measures module import time, cold/warm startup,
+frames per second at several entity densities, HUD rendering cost, collision
+throughput and memory growth over a simulated 30 minute session. Results are
+saved as JSON; --compare fails when a metric regresses beyond the threshold
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from headless_runner import jump_when_near
+
+# Run from the repository root so the game finds dpgame/
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# name -> (unit, higher_is_better, noise floor below which a change is never a regression)
+METRICS = {
+    "import_s": ("s", False, 0.02),
+    "startup_cold_s": ("s", False, 0.05),
+    "startup_warm_s": ("s", False, 0.05),
+    "fps_density_0": ("frames/s", True, 0),
+    "fps_density_500": ("frames/s", True, 0),
+    "fps_density_5000": ("frames/s", True, 0),
+    "fps_dirty_rects": ("frames/s", True, 0),
+    "hud_static_us": ("us/frame", False, 2),
+    "hud_changing_us": ("us/frame", False, 2),
+    "collide_sorted_per_s": ("tests/s", True, 0),
+    "collide_arrays_per_s": ("tests/s", True, 0),
+    "sim_ticks_per_s": ("ticks/s", True, 0),
+    "memory_growth_kb": ("KiB", False, 256),
+}
+
+SESSION_TICKS = 30 * 60 * 60  # 30 minutes at 60 ticks per second
+
+# Importing must stay cheap: no pygame init, window or asset loading until init()
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); import game_with_assets; "
+    "print('IMPORT', time.perf_counter() - start)"
+)
+
+# {settings} is replaced with assignments to game settings made before init()
+STARTUP_SNIPPET = (
+    "import time; start = time.perf_counter(); import game_with_assets; {settings}game_with_assets.init(); "
+    "game_with_assets.finish_loading(); print('STARTUP', time.perf_counter() - start)"
+)
+
+
+def best_time(fn, repeats=5):
+    """Shortest wall time of `repeats` calls; the minimum is the least noisy estimate."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _median_in_subprocess(snippet, marker, env, runs):
+    """Median of the seconds `snippet` prints after `marker`, each run in a fresh process."""
+    times = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", snippet], cwd=REPO_DIR, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        times.append(float(output.rsplit(marker, 1)[1]))
+    return statistics.median(times)
+
+
+def measure_import(runs=3):
+    """Median wall time of only importing game_with_assets in a fresh process."""
+    return _median_in_subprocess(IMPORT_SNIPPET, "IMPORT", dict(os.environ), runs)
+
+
+def measure_startup(cache_dir=None, runs=3):
+    """Median wall time of importing game_with_assets, init() and finishing its asset loading in a fresh process.
+
+    With `cache_dir` (an empty directory) the start is cold: the sprite atlas is built
+    from the PNGs and the asset bundle is not used. Otherwise one untimed start first
+    makes sure the atlas cache is current, so only warm starts are timed.
+    """
+    env = dict(os.environ)
+    settings = ""
+    if cache_dir is not None:
+        env["DINO_SPRITE_CACHE"] = cache_dir
+        settings = "game_with_assets.ASSET_BUNDLE = None; "
+    snippet = STARTUP_SNIPPET.format(settings=settings)
+    if cache_dir is None:
+        _median_in_subprocess(snippet, "STARTUP", env, 1)
+    return _median_in_subprocess(snippet, "STARTUP", env, runs)
+
+
+def import_game():
+    """Import the game module quietly (its asset loader prints every file)."""
+    os.chdir(REPO_DIR)
+    sys.path.insert(0, REPO_DIR)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import game_with_assets
+        game_with_assets.init()
+        game_with_assets.finish_loading()
+    return game_with_assets
+
+
+def play_tick(sim):
+    """One tick of a bot-played session; a crashed game is replaced by the next seed."""
+    jump_when_near(sim)
+    if not sim.step():
+        sim.reset(sim.seed + 1)
+    sim.events.clear()
+
+
+def measure_fps(game, density, frames=600, repeats=3, dirty_rects=False):
+    """Uncapped frames per second of simulation + render at `density` coin rain entities.
+
+    Renders with full flips and a scrolling background, or with `dirty_rects` and a
+    still background (SCROLL_BACKGROUND off), the case dirty rects are meant for.
+    Best of `repeats` runs, so background noise on the machine doesn't read as a regression.
+    """
+    from dirty_renderer import DirtyRectRenderer
+    from game_simulation import GameSimulation
+
+    best = 0.0
+    for _ in range(repeats):
+        sim = GameSimulation(seed=1, sizes=game.sprite_sizes_from_surfaces(), masks=game.sprite_masks())
+        renderer = DirtyRectRenderer(game.screen, enabled=dirty_rects, display=game.display)
+        game.parallax.reset()
+        start = time.perf_counter()
+        for _ in range(frames):
+            if density and sim.rain_coins.count < density:
+                sim.start_coin_rain(density - sim.rain_coins.count)
+            play_tick(sim)
+            if not dirty_rects:
+                game.parallax.scroll(sim.current_game_speed)
+            game.draw_scene(sim, renderer)
+            renderer.present()
+        best = max(best, frames / (time.perf_counter() - start))
+        if dirty_rects and renderer.partial_frames == 0:
+            raise RuntimeError("dirty rect benchmark never took the partial update path")
+    return best
+
+
+def measure_hud(game, frames=2000):
+    """Microseconds per HUD draw with unchanged and with changing counter values."""
+    hud, screen = game.hud, game.screen
+
+    def static():
+        for _ in range(frames):
+            hud.draw(screen, 1234, 56, 7)
+
+    def changing():
+        for i in range(frames):
+            hud.draw(screen, i, i // 10, i // 100)
+
+    return best_time(static) / frames * 1e6, best_time(changing) / frames * 1e6
+
+
+def measure_collisions(entities=1000, repeats=100):
+    """Entity tests per second for the object sweep and the NumPy array sweep."""
+    import numpy as np
+    import pygame
+
+    from collision import collide_arrays, collide_sorted
+    from game_simulation import Coin
+
+    box = pygame.Rect(120, 290, 80, 100)
+    # Worst case for the sweep: every entity starts left of the box's right edge
+    coins = [Coin(-entities * 10 + i * 10, 300, False, (30, 30)) for i in range(entities)]
+    sorted_rate = entities * repeats / best_time(lambda: [collide_sorted(box, coins) for _ in range(repeats)])
+
+    count = entities * 100
+    x = np.sort(np.random.default_rng(0).uniform(-1000, 200, count)).astype(np.float32)
+    y = np.full(count, 300, dtype=np.float32)
+    w = np.full(count, 30, dtype=np.int32)
+    h = np.full(count, 30, dtype=np.int32)
+    arrays_rate = count * repeats / best_time(lambda: [collide_arrays(box, x, y, w, h, 30) for _ in range(repeats)])
+    return sorted_rate, arrays_rate
+
+
+def measure_session(ticks=SESSION_TICKS, warmup=3600):
+    """Ticks per second and traced memory growth over a simulated session (after a warm-up minute).
+
+    A bot plays back-to-back games, so reset() and the per-game setup are part of it.
+    """
+    from game_simulation import GameSimulation
+
+    def play(sim, count):
+        for _ in range(count):
+            play_tick(sim)
+
+    # Speed without tracemalloc, which slows every allocation down
+    sim = GameSimulation(seed=7)
+    play(sim, warmup)
+    start = time.perf_counter()
+    play(sim, ticks)
+    rate = ticks / (time.perf_counter() - start)
+
+    sim = GameSimulation(seed=7)
+    play(sim, warmup)
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    play(sim, ticks)
+    growth = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return rate, growth / 1024
+
+
+def run_suite(quick=False):
+    results = {}
+    print("Measuring import and startup...")
+    results["import_s"] = measure_import(runs=1 if quick else 3)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        results["startup_cold_s"] = measure_startup(cache_dir, runs=1)
+    results["startup_warm_s"] = measure_startup(runs=1 if quick else 3)
+
+    game = import_game()
+    frames = 120 if quick else 600
+    for density in (0, 500, 5000):
+        print(f"Measuring fps with {density} extra entities...")
+        results[f"fps_density_{density}"] = measure_fps(game, density, frames)
+    print("Measuring fps with dirty rects and a still background...")
+    results["fps_dirty_rects"] = measure_fps(game, 0, frames, dirty_rects=True)
+
+    print("Measuring HUD rendering...")
+    results["hud_static_us"], results["hud_changing_us"] = measure_hud(game)
+
+    print("Measuring collision throughput...")
+    results["collide_sorted_per_s"], results["collide_arrays_per_s"] = measure_collisions()
+
+    print("Measuring a simulated 30 minute session...")
+    ticks = SESSION_TICKS // 10 if quick else SESSION_TICKS
+    results["sim_ticks_per_s"], results["memory_growth_kb"] = measure_session(ticks)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return the list of (metric, baseline, current, change) that regressed beyond `threshold`."""
+    regressions = []
+    for name, value in results.items():
+        if name not in baseline or name not in METRICS:
+            continue
+        _, higher_is_better, noise = METRICS[name]
+        old = baseline[name]
+        delta = value - old
+        worse = -delta if higher_is_better else delta
+        if worse > noise and worse > abs(old) * threshold:
+            regressions.append((name, old, value, delta / old if old else float("inf")))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark game_with_assets.py under SDL dummy drivers.")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="where to save the results")
+    parser.add_argument("--compare", metavar="BASELINE", help="fail if results regress against this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative regression (0.10 = 10%%)")
+    parser.add_argument("--quick", action="store_true", help="fewer frames and a 3 minute session")
+    args = parser.parse_args()
+
+    results = run_suite(args.quick)
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "quick": args.quick,
+        "metrics": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print()
+    for name, value in results.items():
+        print(f"  {name:<22} {value:14.3f} {METRICS[name][0]}")
+    print(f"Results saved to: {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["metrics"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nPerformance regressions beyond {args.threshold:.0%}:")
+            for name, old, new, change in regressions:
+                print(f"  {name:<22} {old:14.3f} -> {new:14.3f} ({change:+.1%})")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""
+Collision - Batched broad-phase tests of one box against many entities
+Entities are expected sorted by x; they all scroll left at the same speed, so
+the order holds as long as new entities are inserted at their x (spawn x is
+jittered, so spawn order alone is not x order). The sweep stops at the first
+entity starting right of the box, so entities far to the right are never tested. Functions return the
+indices that were hit and leave the game logic to the caller. Pixel masks are
+only compared for pairs whose rects already overlap
+"""
+import numpy as np
+
+# Shared empty result, so a tick without hits allocates nothing
+NO_HITS = ()
+
+
+def collide_sorted(box, entities):
+    """Indices of `entities` (objects with a .rect, sorted by x) whose rect overlaps `box`."""
+    right = box.right
+    hits = NO_HITS
+    for index, entity in enumerate(entities):
+        rect = entity.rect
+        if rect.x >= right:
+            break
+        if box.colliderect(rect):
+            if hits is NO_HITS:
+                hits = []
+            hits.append(index)
+    return hits
+
+
+def masks_overlap(mask, position, other_mask, other_position):
+    """True if `mask` drawn at `position` and `other_mask` at `other_position` share a solid pixel."""
+    offset = (other_position[0] - position[0], other_position[1] - position[1])
+    return mask.overlap(other_mask, offset) is not None
+
+
+def collide_arrays(box, x, y, w, h, max_width=None):
+    """Indices of the boxes (x, y, w, h arrays, sorted by x) that overlap `box`.
+
+    Only the slice that can reach the box horizontally is tested: boxes starting
+    right of box.right or ending before box.left (given the widest box
+    `max_width`) are skipped with two binary searches.
+    """
+    left, top, width, height = box
+    if max_width is None:
+        max_width = int(w.max()) if len(w) else 0
+    start = int(np.searchsorted(x, left - max_width, side="right"))
+    end = int(np.searchsorted(x, left + width, side="left"))
+    if start >= end:
+        return np.empty(0, dtype=np.intp)
+    xs, ys = x[start:end], y[start:end]
+    mask = (
+        (xs + w[start:end] > left)
+        & (ys < top + height) & (ys + h[start:end] > top)
+    )
+    return np.flatnonzero(mask) + start
@@ -0,0 +1,102 @@
+"""
+Difficulty - Elapsed simulation time -> scroll speed, spawn intervals and special-coin chance
+A profile is a set of keyframe curves, (seconds, multiplier of the base value),
+interpolated linearly. Curves are expanded once into per-tick lookup tables
+shared by every game with the same profile and base values, so step() only
+indexes lists; past the end of the tables the last value holds. Difficulty
+depends on simulated ticks only, never on frame rate or performance settings
+"""
+
+# Length of the per-tick tables; later ticks reuse the last entry
+TABLE_SECONDS = 300
+
+# Profile name -> curve name -> [(seconds, multiplier)]
+PROFILES = {
+    # Speed grows by 0.06 per second (the old +0.001 per tick) up to 2.5x, spawns stay as they were
+    "classic": {
+        "speed": [(0, 1.0), (125, 2.5)],
+        "obstacle_interval": [(0, 1.0)],
+        "coin_interval": [(0, 1.0)],
+        "special_coin_chance": [(0, 1.0)],
+    },
+    "relaxed": {
+        "speed": [(0, 0.8), (180, 1.6)],
+        "obstacle_interval": [(0, 1.3), (180, 1.0)],
+        "coin_interval": [(0, 0.8)],
+        "special_coin_chance": [(0, 1.5)],
+    },
+    "hard": {
+        "speed": [(0, 1.2), (90, 3.0)],
+        "obstacle_interval": [(0, 1.0), (90, 0.6)],
+        "coin_interval": [(0, 1.2)],
+        "special_coin_chance": [(0, 0.5)],
+    },
+}
+
+# (profile, base values...) -> tables, built on first use
+_TABLES = {}
+
+
+def _curve(keyframes, tick_rate, length):
+    """Per-tick values of piecewise-linear `keyframes` over `length` ticks."""
+    values = []
+    index = 0
+    for tick in range(length):
+        seconds = tick / tick_rate
+        while index + 1 < len(keyframes) and keyframes[index + 1][0] <= seconds:
+            index += 1
+        start_seconds, start_value = keyframes[index]
+        if index + 1 < len(keyframes):
+            end_seconds, end_value = keyframes[index + 1]
+            fraction = (seconds - start_seconds) / (end_seconds - start_seconds)
+            values.append(start_value + (end_value - start_value) * max(fraction, 0.0))
+        else:
+            values.append(start_value)
+    return values
+
+
+def _interval_table(multipliers, interval):
+    low, high = interval
+    # Identical multipliers share one tuple, so the table stays small in memory
+    cache = {}
+    table = []
+    for multiplier in multipliers:
+        value = cache.get(multiplier)
+        if value is None:
+            value = cache[multiplier] = (max(1, round(low * multiplier)), max(1, round(high * multiplier)))
+        table.append(value)
+    return table
+
+
+class DifficultyCurve:
+    """Lookup tables of one profile; *_at(tick) return the values for that simulation tick."""
+
+    def __init__(self, profile, tick_rate, base_speed, obstacle_interval, coin_interval, special_coin_chance):
+        if profile not in PROFILES:
+            raise ValueError(f"unknown difficulty profile {profile!r}, expected one of {', '.join(PROFILES)}")
+        self.profile = profile
+        key = (profile, tick_rate, base_speed, tuple(obstacle_interval), tuple(coin_interval), special_coin_chance)
+        tables = _TABLES.get(key)
+        if tables is None:
+            curves = PROFILES[profile]
+            length = TABLE_SECONDS * tick_rate
+            tables = _TABLES[key] = (
+                [base_speed * m for m in _curve(curves["speed"], tick_rate, length)],
+                _interval_table(_curve(curves["obstacle_interval"], tick_rate, length), obstacle_interval),
+                _interval_table(_curve(curves["coin_interval"], tick_rate, length), coin_interval),
+                [min(1.0, special_coin_chance * m) for m in _curve(curves["special_coin_chance"], tick_rate, length)],
+            )
+        self.speed, self.obstacle_interval, self.coin_interval, self.special_coin_chance = tables
+        self.last_tick = len(self.speed) - 1
+
+    def speed_at(self, tick):
+        return self.speed[min(tick, self.last_tick)]
+
+    def obstacle_interval_at(self, tick):
+        return self.obstacle_interval[min(tick, self.last_tick)]
+
+    def coin_interval_at(self, tick):
+        return self.coin_interval[min(tick, self.last_tick)]
+
+    def special_coin_chance_at(self, tick):
+        return self.special_coin_chance[min(tick, self.last_tick)]
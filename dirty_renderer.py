@@ -0,0 +1,69 @@
+"""
+Dirty Renderer - Pushes only the rectangles that changed to the display
+Sprites are erased by restoring a cached backdrop under last frame's rects, and
+pygame.display.update(rects) replaces the full-screen flip. Whenever the
+backdrop itself moves (parallax scrolling) it falls back to a full flip.
+Frames are presented through a DisplayScaler when the screen is an offscreen canvas
+"""
+import pygame
+
+
+class DirtyRectRenderer:
+    """Tracks the screen rects drawn each frame; in flip mode it simply calls display.flip()."""
+
+    def __init__(self, screen, enabled=True, display=None):
+        self.screen = screen
+        self.enabled = enabled
+        self._flip = display.flip if display is not None else pygame.display.flip
+        self._update = display.update if display is not None else pygame.display.update
+        self.backdrop = None
+        self.full_redraw = True
+        self._previous = []
+        self._current = []
+        # Frame counters so the two paths can be benchmarked against each other
+        self.full_frames = 0
+        self.partial_frames = 0
+
+    def begin_frame(self, backdrop_moved, draw_backdrop):
+        """Start a frame; `draw_backdrop(surface)` paints the background and ground line.
+
+        The backdrop is redrawn in full (and the frame flipped) when dirty rects are
+        disabled, when it moved since last frame or when nothing is cached yet.
+        Otherwise only the areas covered by last frame's sprites are restored.
+        """
+        self._current = []
+        if not self.enabled or backdrop_moved or self.backdrop is None:
+            draw_backdrop(self.screen)
+            self.full_redraw = True
+            if self.enabled and not backdrop_moved:
+                # Cache the still backdrop so later frames can erase sprites from it
+                self.backdrop = self.screen.copy()
+            elif backdrop_moved:
+                self.backdrop = None
+        else:
+            self.full_redraw = False
+            for rect in self._previous:
+                self.screen.blit(self.backdrop, rect, rect)
+
+    def add(self, rect):
+        """Record a rect returned by Surface.blit() (or a list of them)."""
+        if isinstance(rect, list):
+            self._current.extend(rect)
+        elif rect is not None:
+            self._current.append(rect)
+
+    def present(self):
+        """Push this frame to the display."""
+        if self.full_redraw:
+            self._flip()
+            self.full_frames += 1
+        else:
+            # Old positions must be pushed too, so the erased sprites disappear
+            self._update(self._previous + self._current)
+            self.partial_frames += 1
+        self._previous = self._current
+
+    def invalidate(self):
+        """Force a full redraw on the next frame (e.g. after a menu screen)."""
+        self.backdrop = None
+        self._previous = []
@@ -0,0 +1,83 @@
+"""
+Display Scaler - The game draws into a fixed-size canvas that is scaled to the window in one step
+"scaled" makes the canvas the display surface of a pygame.SCALED window, so SDL
+stretches it on the GPU with the aspect ratio kept. "integer" scales it in
+software by the largest whole factor that fits (sharp pixels, black borders)
+straight into a cached subsurface of the window; dirty rects are scaled one by
+one. Either way everything the game draws, and every asset it scales, stays at
+the canvas resolution whatever the size of the screen
+"""
+import pygame
+
+SCALING_MODES = ("scaled", "integer")
+
+# Share of the desktop a window may cover when picking its integer factor
+WINDOW_FILL = 0.9
+
+
+class DisplayScaler:
+    """Opens the window for a `canvas_size` canvas; flip()/update() present the canvas."""
+
+    def __init__(self, canvas_size, mode="scaled", fullscreen=False):
+        if mode not in SCALING_MODES:
+            raise ValueError(f"unknown display scaling {mode!r}, expected one of {', '.join(SCALING_MODES)}")
+        self.canvas_size = canvas_size
+        self.factor = 1
+        self._view = None  # Área de la ventana donde se escala el lienzo (modo "integer")
+        self._offset = (0, 0)
+        flags = pygame.FULLSCREEN if fullscreen else 0
+
+        if mode == "scaled":
+            try:
+                self.window = self.canvas = pygame.display.set_mode(canvas_size, flags | pygame.SCALED)
+            except pygame.error as e:
+                print(f"pygame.SCALED not available ({e}), using integer scaling")
+                mode = "integer"
+        if mode == "integer":
+            self._open_integer(canvas_size, flags, fullscreen)
+        self.mode = mode
+        window_width, window_height = pygame.display.get_window_size()
+        print(f"Display: {canvas_size[0]}x{canvas_size[1]} canvas -> {window_width}x{window_height} window "
+              f"({mode}{f' x{self.factor}' if mode == 'integer' else ''})")
+
+    def _open_integer(self, canvas_size, flags, fullscreen):
+        width, height = canvas_size
+        desktop_width, desktop_height = pygame.display.get_desktop_sizes()[0]
+        if not fullscreen:
+            desktop_width, desktop_height = int(desktop_width * WINDOW_FILL), int(desktop_height * WINDOW_FILL)
+        self.factor = max(1, min(desktop_width // width, desktop_height // height))
+        view = pygame.Rect(0, 0, width * self.factor, height * self.factor)
+        window_size = (max(desktop_width, view.width), max(desktop_height, view.height)) if fullscreen else view.size
+        self.window = pygame.display.set_mode(window_size, flags)
+        if window_size == canvas_size:
+            # Nada que escalar: se dibuja directamente en la ventana
+            self.canvas = self.window
+            return
+        self.canvas = pygame.Surface(canvas_size).convert()
+        view.center = self.window.get_rect().center
+        self.window.fill((0, 0, 0))
+        self._view = self.window.subsurface(view)
+        self._offset = view.topleft
+
+    def flip(self):
+        """Present the whole canvas."""
+        if self._view is not None:
+            pygame.transform.scale(self.canvas, self._view.get_size(), self._view)
+        pygame.display.flip()
+
+    def update(self, rects):
+        """Present only the canvas areas in `rects` (Surface.blit() results)."""
+        if self._view is None:
+            pygame.display.update(rects)
+            return
+        factor = self.factor
+        offset_x, offset_y = self._offset
+        bounds = self.canvas.get_rect()
+        updated = []
+        for rect in rects:
+            rect = bounds.clip(rect)
+            if rect.width and rect.height:
+                target = pygame.Rect(rect.x * factor, rect.y * factor, rect.width * factor, rect.height * factor)
+                pygame.transform.scale(self.canvas.subsurface(rect), target.size, self._view.subsurface(target))
+                updated.append(target.move(offset_x, offset_y))
+        pygame.display.update(updated)
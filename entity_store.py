@@ -0,0 +1,123 @@
+"""
+Entity Store - Struct-of-arrays storage for large numbers of moving entities
+Positions, sizes and flags live in NumPy arrays so movement, off-screen culling
+and collision run as batch operations instead of per-object Python code. Rows
+stay sorted by x: spawns re-sort when needed and removals compact in order
+"""
+import numpy as np
+
+from collision import collide_arrays
+
+# Flag bits
+FLAG_SPECIAL = 1  # HivePower coin instead of HBD Coin
+
+
+class EntityStore:
+    """Growable arrays of (x, prev_x, y, w, h, flags); only the first `count` rows are live."""
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.max_width = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        old = self.count
+        x = np.zeros(capacity, dtype=np.float32)
+        prev_x = np.zeros(capacity, dtype=np.float32)
+        y = np.zeros(capacity, dtype=np.float32)
+        w = np.zeros(capacity, dtype=np.int32)
+        h = np.zeros(capacity, dtype=np.int32)
+        flags = np.zeros(capacity, dtype=np.uint8)
+        if old:
+            x[:old], prev_x[:old], y[:old] = self._x[:old], self._prev_x[:old], self._y[:old]
+            w[:old], h[:old] = self._w[:old], self._h[:old]
+            flags[:old] = self._flags[:old]
+        self._x, self._prev_x, self._y = x, prev_x, y
+        self._w, self._h, self._flags = w, h, flags
+
+    @property
+    def capacity(self):
+        return len(self._x)
+
+    # Views over the live rows; writes through them update the store
+    @property
+    def x(self):
+        return self._x[:self.count]
+
+    @property
+    def prev_x(self):
+        return self._prev_x[:self.count]
+
+    @property
+    def y(self):
+        return self._y[:self.count]
+
+    @property
+    def w(self):
+        return self._w[:self.count]
+
+    @property
+    def h(self):
+        return self._h[:self.count]
+
+    @property
+    def flags(self):
+        return self._flags[:self.count]
+
+    def __len__(self):
+        return self.count
+
+    def spawn_many(self, xs, ys, w, h, flags=0):
+        """Append len(xs) entities at once; w, h and flags may be scalars or arrays."""
+        n = len(xs)
+        start, end = self.count, self.count + n
+        if end > self.capacity:
+            self._allocate(max(end, self.capacity * 2))
+        self._x[start:end] = xs
+        self._prev_x[start:end] = xs
+        self._y[start:end] = ys
+        self._w[start:end] = w
+        self._h[start:end] = h
+        self._flags[start:end] = flags
+        self.count = end
+        self.max_width = max(self.max_width, int(np.max(w)))
+        # Keep the sweep order if the new rows don't already extend it
+        if np.any(np.diff(self._x[max(start - 1, 0):end]) < 0):
+            self.sort_by_x()
+        return start
+
+    def sort_by_x(self):
+        """Reorder the live rows by x; entities all move at the same speed, so it holds afterwards."""
+        order = np.argsort(self.x, kind="stable")
+        for array in (self._x, self._prev_x, self._y, self._w, self._h, self._flags):
+            array[:self.count] = array[:self.count][order]
+
+    def remove_where(self, mask):
+        """Remove every live row where `mask` is True in one vectorized compaction (order is kept)."""
+        keep = ~mask
+        kept = int(np.count_nonzero(keep))
+        if kept == self.count:
+            return 0
+        for array in (self._x, self._prev_x, self._y, self._w, self._h, self._flags):
+            array[:kept] = array[:self.count][keep]
+        removed = self.count - kept
+        self.count = kept
+        return removed
+
+    def clear(self):
+        self.count = 0
+        self.max_width = 0
+
+    def advance(self, dx):
+        """Move every entity `dx` pixels to the left, remembering the previous position."""
+        n = self.count
+        self._prev_x[:n] = self._x[:n]
+        self._x[:n] -= dx
+
+    def off_screen(self):
+        """Mask of entities that scrolled past the left edge."""
+        return self.x + self.w < 0
+
+    def collide(self, rect):
+        """Indices of the entities overlapping `rect`, via a sorted-by-x sweep."""
+        return collide_arrays(rect, self.x, self.y, self.w, self.h, self.max_width)
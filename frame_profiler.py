@@ -0,0 +1,127 @@
+"""
+Frame Profiler - Per-phase frame timing for main_game()
+Each phase of a frame is timed with mark(); rolling p50/p95/p99 are shown in an
+on-screen overlay and every frame can be streamed to a CSV or JSON-lines file
+"""
+import collections
+import csv
+import json
+import time
+
+import pygame
+
+# Phases in the order main_game() marks them
+PHASES = (
+    "events",  # pygame.event.get() and input handling
+    "character",  # character.update()
+    "spawn",  # scheduled spawns
+    "entities",  # entity update, collisions and scoring
+    "sound",  # sound cues of the frame
+    "background",  # background and ground line
+    "draw",  # obstacles, coins, airplanes and character
+    "hud",  # score and coin counters
+    "flip",  # display.flip() / display.update(rects)
+    "tick_wait",  # clock.tick() frame limiter
+)
+
+# Frames between overlay refreshes, so the overlay itself stays cheap
+OVERLAY_REFRESH = 30
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    """Accumulates time per phase for the current frame and keeps a rolling window of frames."""
+
+    def __init__(self, window=600, log_path=None):
+        self.window = window
+        self.samples = {phase: collections.deque(maxlen=window) for phase in PHASES}
+        self.totals = collections.deque(maxlen=window)
+        self.frame = 0
+        self.show_overlay = False
+        self._current = dict.fromkeys(PHASES, 0.0)
+        self._frame_start = self._last = time.perf_counter()
+        self._overlay = None
+        self._font = None
+
+        self._log_file = None
+        self._writer = None
+        if log_path:
+            self._log_file = open(log_path, "w", newline="", encoding="utf-8")
+            self._json_lines = log_path.endswith((".jsonl", ".json"))
+            if not self._json_lines:
+                self._writer = csv.writer(self._log_file)
+                self._writer.writerow(("frame", "total_ms") + tuple(f"{phase}_ms" for phase in PHASES))
+            print(f"Writing frame times to: {log_path}")
+
+    def begin_frame(self):
+        self._frame_start = self._last = time.perf_counter()
+
+    def mark(self, phase):
+        """Charge the time since the previous mark to `phase` (summed if marked several times)."""
+        now = time.perf_counter()
+        self._current[phase] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        """Close the frame: store it in the rolling window and the log."""
+        current = self._current
+        total = self._last - self._frame_start
+        self.frame += 1
+        for phase in PHASES:
+            self.samples[phase].append(current[phase])
+        self.totals.append(total)
+
+        if self._writer is not None:
+            self._writer.writerow([self.frame, f"{total * 1000:.3f}"]
+                                  + [f"{current[phase] * 1000:.3f}" for phase in PHASES])
+        elif self._log_file is not None:
+            record = {"frame": self.frame, "total_ms": round(total * 1000, 3)}
+            record.update({phase: round(current[phase] * 1000, 3) for phase in PHASES})
+            self._log_file.write(json.dumps(record) + "\n")
+
+        for phase in PHASES:
+            current[phase] = 0.0
+
+    def stats(self):
+        """{phase: (p50, p95, p99)} in milliseconds over the rolling window, plus "total"."""
+        result = {}
+        for phase, values in list(self.samples.items()) + [("total", self.totals)]:
+            ordered = sorted(values)
+            result[phase] = tuple(percentile(ordered, q) * 1000 for q in (0.50, 0.95, 0.99))
+        return result
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+        self._overlay = None
+
+    def draw_overlay(self, surface, pos=(10, 130)):
+        """Blit the p50/p95/p99 table; it is re-rendered every OVERLAY_REFRESH frames."""
+        if not self.show_overlay:
+            return None
+        if self._overlay is None or self.frame % OVERLAY_REFRESH == 0:
+            if self._font is None:
+                self._font = pygame.font.SysFont("monospace", 14)
+            font = self._font
+            lines = [f"{'phase':<11} {'p50':>6} {'p95':>6} {'p99':>6}"]
+            for phase, (p50, p95, p99) in self.stats().items():
+                lines.append(f"{phase:<11} {p50:6.2f} {p95:6.2f} {p99:6.2f}")
+            line_height = font.get_linesize()
+            rendered = [font.render(line, True, (255, 255, 0)) for line in lines]
+            width = max(line.get_width() for line in rendered)
+            self._overlay = pygame.Surface((width + 8, line_height * len(rendered) + 8))
+            self._overlay.set_alpha(200)
+            for i, line in enumerate(rendered):
+                self._overlay.blit(line, (4, 4 + i * line_height))
+        return surface.blit(self._overlay, pos)
+
+    def close(self):
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = self._writer = None
@@ -0,0 +1,492 @@
+"""
+Game Simulation - Pure game logic for game_with_assets.py
+Physics, spawning and collisions of the character, obstacles, coins and airplanes,
+without display, mixer or fonts, so games can be stepped faster than real time
+"""
+import bisect
+import operator
+import os
+import random
+import struct
+
+import numpy as np
+import pygame
+
+import spawn_schedule
+from collision import collide_sorted, masks_overlap
+from difficulty import DifficultyCurve
+from entity_store import FLAG_SPECIAL, EntityStore
+from spawn_schedule import SpawnScheduler
+from sprite_atlas import load_masks, scaled_size
+
+# Set the asset directory path
+ASSET_DIR = "dpgame"
+
+# Configuración lógica de la ventana
+WIDTH, HEIGHT = 800, 450
+
+# Constantes del juego
+GRAVITY = 1
+JUMP_STRENGTH = -16
+GAME_SPEED = 5  # Velocidad base; el perfil de dificultad la escala con el tiempo
+GROUND_HEIGHT = HEIGHT - 40
+
+# Fixed simulation rate: step() always advances exactly one tick of this length,
+# whatever rate the game is rendered at
+TICK_RATE = 60
+TICK_SECONDS = 1.0 / TICK_RATE
+
+# Coin rain: a burst of coins spread over this many pixels right of the screen,
+# repeated every COIN_RAIN_INTERVAL ticks, kept in an EntityStore for batch updates
+COIN_RAIN_INTERVAL = 600
+COIN_RAIN_SPREAD = 2400
+COIN_RAIN_SPECIAL_CHANCE = 0.05
+
+# Sprites packed into the atlas: nombre -> (archivo, altura destino)
+ATLAS_SPRITES = {
+    "run_1": ("run_1.png", 120),
+    "run_2": ("run_2.png", 120),
+    "run_3": ("run_3.png", 120),
+    "jump": ("jump.png", 120),
+    "duck": ("duck.png", 60),
+    "coin": ("coin.png", 30),
+    "coin2": ("coin2.png", 40),
+}
+ATLAS_SPRITES.update({f"obstacle_{i}": (f"obstacle_{i}.png", 80) for i in range(1, 7)})
+
+# The airplane banner is only needed once playing, so it has its own lazily loaded atlas
+AIRPLANE_SPRITES = {"airplane_banner": ("airplane_banner.png", 150)}
+
+# Sprites whose size the simulation needs, taken from the atlas tables: nombre en
+# self.sizes -> (archivo, altura destino). Every run frame has run_1's size
+SPRITE_HEIGHTS = {
+    {"run_1": "run", "airplane_banner": "airplane"}.get(name, name): entry
+    for name, entry in {**ATLAS_SPRITES, **AIRPLANE_SPRITES}.items()
+    if name not in ("run_2", "run_3")
+}
+
+
+def png_size(path):
+    """Read the (width, height) of a PNG from its IHDR chunk without decoding it."""
+    with open(path, "rb") as f:
+        header = f.read(24)
+    if header[:8] != b"\x89PNG\r\n\x1a\n":
+        raise ValueError(f"'{path}' is not a PNG file")
+    return struct.unpack(">II", header[16:24])
+
+
+def sprite_sizes(asset_dir=ASSET_DIR):
+    """Return the scaled (width, height) of every sprite, matching the sprite atlas."""
+    sizes = {}
+    for name, (file_name, target_height) in SPRITE_HEIGHTS.items():
+        try:
+            sizes[name] = scaled_size(png_size(os.path.join(asset_dir, file_name)), target_height)
+        except (OSError, ValueError):
+            # Same size as the magenta placeholder used by load_and_scale()
+            sizes[name] = (50, target_height)
+    return sizes
+
+
+# Clave de orden de las listas de entidades: collide_sorted() y el descarte por la
+# izquierda necesitan que estén ordenadas por x
+X_ORDER = operator.attrgetter("x")
+
+# Sprites de la animación de correr, en orden
+RUN_SPRITES = ("run_1", "run_2", "run_3")
+
+# Clase para el personaje
+class Character:
+    __slots__ = ("events", "x", "y", "prev_y", "vel_y", "is_jumping", "is_ducking",
+                 "run_animation_count", "animation_speed", "frame_counter", "rect")
+
+    def __init__(self, events=None):
+        # Sound cues ("jump", "run") are reported here instead of being played
+        self.events = events if events is not None else []
+        self.rect = pygame.Rect(0, 0, 0, 0)  # Se actualiza en el sitio, nunca se reemplaza
+        self.reset()
+
+    def reset(self):
+        self.x = 100
+        self.y = GROUND_HEIGHT - 120  # Posición inicial sobre el suelo
+        self.prev_y = self.y  # Posición del tick anterior, para interpolar al dibujar
+        self.vel_y = 0
+        self.is_jumping = False
+        self.is_ducking = False
+        self.run_animation_count = 0
+        self.animation_speed = 5  # Frames entre cambios de animación
+        self.frame_counter = 0
+        self.rect.update(self.x + 20, self.y + 20, 80, 100)  # Colisión ajustada
+
+    def update(self):
+        self.prev_y = self.y
+
+        # Aplicar gravedad
+        self.vel_y += GRAVITY
+        self.y += self.vel_y
+
+        # Limitar al suelo
+        if self.y > GROUND_HEIGHT - 120 and not self.is_ducking:
+            self.y = GROUND_HEIGHT - 120
+            self.vel_y = 0
+            self.is_jumping = False
+
+        # Limitar el personaje agachado al suelo
+        if self.is_ducking:
+            if self.y > GROUND_HEIGHT - 60:  # Posición más baja para agacharse
+                self.y = GROUND_HEIGHT - 60
+                self.vel_y = 0
+                self.is_jumping = False
+
+        # Actualizar el rectángulo de colisión según el estado
+        if self.is_ducking:
+            self.rect.update(self.x + 20, self.y + 10, 80, 50)  # Colisión más baja al agacharse
+        else:
+            self.rect.update(self.x + 20, self.y + 20, 80, 100)  # Colisión normal
+
+        # Animación de correr
+        if not self.is_jumping and not self.is_ducking:
+            self.frame_counter += 1
+            if self.frame_counter >= self.animation_speed:
+                self.run_animation_count = (self.run_animation_count + 1) % 3
+                self.frame_counter = 0
+
+                # Reproducir sonido de correr en cada cambio de frame
+                if self.run_animation_count == 0:
+                    self.events.append("run")
+
+    @property
+    def sprite(self):
+        """Atlas name of the sprite drawn this tick (same choice as draw_character())."""
+        if self.is_jumping:
+            return "jump"
+        if self.is_ducking:
+            return "duck"
+        return RUN_SPRITES[self.run_animation_count]
+
+    def jump(self):
+        if not self.is_jumping and not self.is_ducking:
+            self.vel_y = JUMP_STRENGTH
+            self.is_jumping = True
+            self.events.append("jump")
+
+    def duck(self, ducking):
+        # Si está saltando, no puede agacharse
+        if self.is_jumping:
+            return
+
+        self.is_ducking = ducking
+
+        # Reproducir sonido al agacharse/levantarse
+        if ducking:
+            self.events.append("run")
+
+# Entities are recycled through an EntityPool: __init__ only allocates the rect,
+# spawn() (re)initializes every field in place
+
+# Clase para los obstáculos
+class Obstacle:
+    __slots__ = ("x", "prev_x", "image_idx", "width", "height", "rect")
+
+    def __init__(self, x, image_idx, size):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.spawn(x, image_idx, size)
+
+    def spawn(self, x, image_idx, size):
+        self.x = self.prev_x = x
+        self.image_idx = image_idx
+        self.width, self.height = size
+        self.rect.update(self.x, GROUND_HEIGHT - self.height, self.width, self.height)
+
+    def update(self, speed):
+        self.prev_x = self.x
+        self.x -= speed
+        self.rect.x = self.x
+
+    def is_off_screen(self):
+        return self.x + self.width < 0
+
+# Clase para monedas (HBD Coins y HivePower)
+class Coin:
+    __slots__ = ("x", "prev_x", "y", "special", "coin_type", "width", "height", "rect",
+                 "collected", "value")
+
+    def __init__(self, x, y, special, size):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.spawn(x, y, special, size)
+
+    def spawn(self, x, y, special, size):
+        self.x = self.prev_x = x
+        self.y = y
+        self.special = special  # True = HivePower (roja), False = HBD Coin (amarilla)
+        self.coin_type = "HivePower" if special else "HBD Coin"
+        self.width, self.height = size
+        self.rect.update(self.x, self.y, self.width, self.height)
+        self.collected = False
+        self.value = 5 if special else 1  # HivePower vale más puntos que las HBD Coins
+
+    def update(self, speed):
+        self.prev_x = self.x
+        self.x -= speed
+        self.rect.x = self.x
+
+    def is_off_screen(self):
+        return self.x + self.width < 0
+
+# Clase para el avión con el banner
+class Airplane:
+    __slots__ = ("x", "prev_x", "y", "speed", "width", "height", "passed")
+
+    def __init__(self, x, y, size):
+        self.spawn(x, y, size)
+
+    def spawn(self, x, y, size):
+        self.x = self.prev_x = x
+        self.y = y
+        self.speed = 3  # Más lento que los obstáculos
+        self.width, self.height = size
+        self.passed = False
+
+    def update(self):
+        self.prev_x = self.x
+        self.x -= self.speed
+
+    def is_off_screen(self):
+        return self.x + self.width < 0
+
+
+class EntityPool:
+    """Free list of released entities; acquire() only constructs a new one when it is empty."""
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = []
+        self.allocations = 0  # Instances ever constructed
+        self.reuses = 0
+
+    def acquire(self, *args):
+        if self.free:
+            entity = self.free.pop()
+            entity.spawn(*args)
+            self.reuses += 1
+            return entity
+        self.allocations += 1
+        return self.cls(*args)
+
+    def release(self, entity):
+        self.free.append(entity)
+
+
+class GameSimulation:
+    """One game of Dino Puku, advanced one fixed TICK_RATE tick at a time by step()."""
+
+    def __init__(self, seed=None, sizes=None, difficulty="classic", coin_rain=0, profiler=None, masks=None):
+        self.sizes = sizes if sizes is not None else sprite_sizes()
+        # Collision masks by atlas sprite name (SpriteAtlas.masks); headless games load them once per process
+        # from the cached atlas, which a cold cache first builds from the source PNGs (see load_masks)
+        self.masks = masks if masks is not None else load_masks(ATLAS_SPRITES, ASSET_DIR)
+        self.obstacle_masks = [self.masks[f"obstacle_{i}"] for i in range(1, 7)]
+        self.character_masks = {name: (self.masks[name],) + self.masks[name].get_size()
+                                for name in RUN_SPRITES + ("jump", "duck")}
+        self.sprite_box = pygame.Rect(0, 0, 0, 0)  # Rect of the character's current sprite
+        self.profiler = profiler  # Optional FrameProfiler timing the phases of step()
+        self.difficulty = difficulty  # Profile name in difficulty.PROFILES
+        self.coin_rain = coin_rain  # Coins per coin rain event, 0 = no coin rain
+        self.obstacle_sizes = [self.sizes[f"obstacle_{i}"] for i in range(1, 7)]
+
+        # Everything below survives reset(), so back-to-back games reuse the same objects
+        self.events = []
+        self.character = Character(self.events)
+        self.obstacle_pool = EntityPool(Obstacle)
+        self.coin_pool = EntityPool(Coin)
+        self.airplane_pool = EntityPool(Airplane)
+        self.obstacles = []
+        self.coins = []
+        self.airplanes = []
+        self.rain_coins = EntityStore()
+
+        # Dificultad según el tiempo simulado (tablas precalculadas por perfil)
+        self.curve = DifficultyCurve(difficulty, TICK_RATE, GAME_SPEED, spawn_schedule.OBSTACLE_INTERVAL,
+                                     spawn_schedule.COIN_INTERVAL, spawn_schedule.SPECIAL_COIN_CHANCE)
+        self.schedule = SpawnScheduler(seed, WIDTH, GROUND_HEIGHT, self.curve)
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """Start a new game with `seed` on the same simulation (and its warm pools)."""
+        self.seed = seed
+        self.rng = random.Random(seed)  # Eventos fuera del calendario (lluvia de monedas)
+        self.events.clear()
+
+        # Reiniciar puntuación y contadores de monedas
+        self.score = 0
+        self.hbd_coins = 0
+        self.hive_power = 0
+        self.frame = 0
+        self.game_over = False
+
+        # Reiniciar los objetos del juego, devolviendo a los pools los de la partida anterior
+        self.character.reset()
+        for pool, entities in ((self.obstacle_pool, self.obstacles), (self.coin_pool, self.coins),
+                               (self.airplane_pool, self.airplanes)):
+            for entity in entities:
+                pool.release(entity)
+            entities.clear()
+        self.rain_coins.clear()
+
+        # Próximas apariciones, generadas de antemano a partir de la semilla
+        self.schedule.reset(seed)
+        self.next_obstacle = next(self.schedule.obstacles)
+        self.next_coin = next(self.schedule.coins)
+        self.next_airplane = next(self.schedule.airplanes)
+
+        # Contadores y temporizadores
+        self.score_timer = 0
+        self.coin_rain_timer = 0
+
+        # Velocidad de desplazamiento del tick actual
+        self.current_game_speed = self.curve.speed_at(0)
+
+    def step(self):
+        """Advance the game by one tick; returns False once the character has crashed."""
+        character = self.character
+        profiler = self.profiler
+        self.frame += 1
+
+        # Actualizar el personaje
+        character.update()
+
+        # Aumentar la velocidad del juego progresivamente (según el tiempo, no los frames)
+        speed = self.current_game_speed = self.curve.speed_at(self.frame)
+        if profiler is not None:
+            profiler.mark("character")
+
+        # Generar obstáculos, monedas y aviones cuando llega su tick programado.
+        # The spawn x is jittered, so a new entity can start left of the previous one
+        # when spawns come close together: insert it in x order instead of appending
+        frame = self.frame
+        while self.next_obstacle[0] == frame:
+            _, new_x, image_idx = self.next_obstacle
+            bisect.insort(self.obstacles, self.obstacle_pool.acquire(new_x, image_idx, self.obstacle_sizes[image_idx]),
+                          key=X_ORDER)
+            self.next_obstacle = next(self.schedule.obstacles)
+
+        while self.next_coin[0] == frame:
+            _, new_x, new_y, special = self.next_coin
+            bisect.insort(self.coins, self.coin_pool.acquire(new_x, new_y, special, self.sizes["coin2" if special else "coin"]),
+                          key=X_ORDER)
+            self.next_coin = next(self.schedule.coins)
+
+        # Airplanes always spawn at the same x, so appending keeps them in order
+        while self.next_airplane[0] == frame:
+            _, new_x, new_y = self.next_airplane
+            self.airplanes.append(self.airplane_pool.acquire(new_x, new_y, self.sizes["airplane"]))
+            self.next_airplane = next(self.schedule.airplanes)
+        if profiler is not None:
+            profiler.mark("spawn")
+
+        # Actualizar obstáculos y comprobar colisiones
+        for obstacle in self.obstacles:
+            obstacle.update(speed)
+
+        # Comprobar colisión con el personaje: primero rects (solo los obstáculos que pueden
+        # alcanzarlo), luego las máscaras de píxeles de los que se tocan
+        mask, width, height = self.character_masks[character.sprite]
+        box = self.sprite_box
+        box.update(character.x, character.y, width, height)
+        for index in collide_sorted(box, self.obstacles):
+            obstacle = self.obstacles[index]
+            if masks_overlap(mask, box.topleft, self.obstacle_masks[obstacle.image_idx], obstacle.rect.topleft):
+                self.game_over = True
+                break
+
+        # Los obstáculos están ordenados por x: los que salen de la pantalla van primero
+        while self.obstacles and self.obstacles[0].is_off_screen():
+            self.obstacle_pool.release(self.obstacles.pop(0))
+
+        # Actualizar monedas y comprobar colecciones
+        for coin in self.coins:
+            coin.update(speed)
+
+        # Comprobar si el personaje recoge monedas
+        hits = collide_sorted(character.rect, self.coins)
+        for index in hits:
+            coin = self.coins[index]
+            coin.collected = True
+            self.score += coin.value
+
+            # Incrementar contador específico según el tipo de moneda
+            if coin.special:
+                self.hive_power += 1  # HivePower (moneda especial)
+            else:
+                self.hbd_coins += 1  # HBD Coins (moneda normal)
+
+            self.events.append("coin")
+
+        for index in reversed(hits):
+            self.coin_pool.release(self.coins.pop(index))
+        while self.coins and self.coins[0].is_off_screen():
+            self.coin_pool.release(self.coins.pop(0))
+
+        # Lluvia de monedas
+        if self.coin_rain:
+            self.coin_rain_timer += 1
+            if self.coin_rain_timer >= COIN_RAIN_INTERVAL:
+                self.start_coin_rain(self.coin_rain)
+                self.coin_rain_timer = 0
+        if self.rain_coins.count:
+            self._update_rain_coins()
+
+        # Actualizar aviones
+        for airplane in self.airplanes:
+            airplane.update()
+
+            # Marcar si el avión ha pasado por la pantalla (para dar puntos)
+            if not airplane.passed and airplane.x < character.x:
+                airplane.passed = True
+                self.score += 2  # Puntos por pasar por debajo del avión
+
+        while self.airplanes and self.airplanes[0].is_off_screen():
+            self.airplane_pool.release(self.airplanes.pop(0))
+
+        # Aumentar la puntuación con el tiempo
+        self.score_timer += 1
+        if self.score_timer >= 30:  # Cada medio segundo
+            self.score += 1
+            self.score_timer = 0
+
+        if profiler is not None:
+            profiler.mark("entities")
+        return not self.game_over
+
+    def start_coin_rain(self, count):
+        """Spawn `count` coins at once just right of the screen."""
+        # Seeded from the game RNG so a seed still reproduces the whole run
+        batch_rng = np.random.default_rng(self.rng.getrandbits(32))
+        xs = WIDTH + batch_rng.integers(0, COIN_RAIN_SPREAD, count)
+        ys = batch_rng.integers(50, GROUND_HEIGHT - 40, count)
+        special = batch_rng.random(count) < COIN_RAIN_SPECIAL_CHANCE
+        w, h = np.where(special[:, None], self.sizes["coin2"], self.sizes["coin"]).T
+        self.rain_coins.spawn_many(xs, ys, w, h, flags=np.where(special, FLAG_SPECIAL, 0))
+
+    def _update_rain_coins(self):
+        store = self.rain_coins
+        store.advance(self.current_game_speed)
+
+        # Recoger en bloque todas las monedas que tocan al personaje
+        hits = store.collide(self.character.rect)
+        collected = len(hits)
+        remove = store.off_screen()
+        if collected:
+            special = int(np.count_nonzero(store.flags[hits] & FLAG_SPECIAL))
+            self.hive_power += special
+            self.hbd_coins += collected - special
+            self.score += (collected - special) + 5 * special
+            self.events.append("coin")
+            remove[hits] = True
+
+        store.remove_where(remove)
+
+    @property
+    def allocations(self):
+        """Entity instances constructed so far; flat in steady state once the pools are warm."""
+        return (self.obstacle_pool.allocations + self.coin_pool.allocations
+                + self.airplane_pool.allocations)
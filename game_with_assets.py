@@ -1,42 +1,130 @@
+import time
+_import_start = time.perf_counter()  # Para informar del coste de importar este módulo
+
 import pygame
 import sys
 import os
+import atexit
 import random
 
-# Set the asset directory path
-ASSET_DIR = "dpgame"
+from game_simulation import (ASSET_DIR, WIDTH, HEIGHT, GROUND_HEIGHT, TICK_RATE, TICK_SECONDS, ATLAS_SPRITES, AIRPLANE_SPRITES,
+                             GameSimulation, sprite_sizes)
+# The game entities live in game_simulation; re-exported for older imports
+from game_simulation import Character, Obstacle, Coin, Airplane
+from asset_manager import AssetManager
+from asset_bundle import BUNDLE_PATH, AssetBundle, open_bundle
+import audio_manager
+from audio_manager import AudioManager
+from sprite_atlas import SpriteAtlas, load_masks, scaled_size
+from hud import HUD
+from dirty_renderer import DirtyRectRenderer
+from display_scaler import DisplayScaler
+from entity_store import FLAG_SPECIAL
+from frame_profiler import FrameProfiler
+from parallax import Parallax, ParallaxLayer
+from quality_governor import QualityGovernor
+from input_events import InputQueue, setup_events, wait_for_key
+from replay import InputRecorder
+from score_store import SCORES_DIR, ScoreStore
+
+# Importing this module only defines the game; init() initializes pygame, opens the
+# window and starts loading the assets, and main() runs the game loop. Settings below
+# can be changed between the import and init()
+
+# Sound - "full" (effects and music), "light" (effects; music only streamed once
+# playing) or "off" for the best performance
+SOUND_MODE = "full"
+
+# Difficulty profile (difficulty.PROFILES): speed and spawn rates over simulated time
+DIFFICULTY = "classic"
+
+# Rendering path - True pushes only changed rects with display.update(rects),
+# False flips the whole screen every frame. Dirty rects only pay off with a still
+# background, so it falls back to full flips while SCROLL_BACKGROUND is on
+DIRTY_RECT_MODE = False
+SCROLL_BACKGROUND = True
+
+# Background layers, back to front: (archivo, altura destino, y, velocidad relativa al juego);
+# the first one is opaque, later ones keep their transparency (e.g. ("clouds.png", 120, 0, 0.2))
+PARALLAX_LAYERS = [
+    ("background.png", HEIGHT, 0, 0.5),  # Más lento que los obstáculos
+]
+
+# Stress test - coins dropped by every coin rain event (0 = off)
+COIN_RAIN = 0
+
+# Frame-time profiler - times every phase of main_game(); F3 toggles the
+# p50/p95/p99 overlay. PROFILE_LOG streams every frame to a .csv or .jsonl file
+PROFILE_FRAMES = False
+PROFILE_LOG = None  # e.g. "frame_times.csv"
 
-# Inicializar Pygame
-pygame.init()
+# Packed asset bundle built with `python asset_bundle.py`; loose files in dpgame/
+# are used when it is missing or older than them (None = always loose files)
+ASSET_BUNDLE = BUNDLE_PATH
 
-# Configuración de la ventana
-WIDTH, HEIGHT = 800, 450
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Juego de Desplazamiento Lateral")
+# Input recording - directory where every finished game is saved as a replay
+# (check them with `python replay.py replays/*.json`); None = off
+RECORD_REPLAYS = None  # e.g. "replays"
 
-# Reloj para controlar la velocidad del juego
-clock = pygame.time.Clock()
+# Render rate cap; gameplay always runs at TICK_RATE regardless of this value
+RENDER_FPS = 60
 
-# Flag to control sound - can be turned off for better performance
-ENABLE_SOUND = True
+# Display - everything is drawn into a fixed canvas that is scaled to the window in
+# one step: "scaled" (pygame.SCALED, done by SDL on the GPU) or "integer" (largest
+# whole factor that fits, sharp pixels, black borders). FULLSCREEN fills the monitor
+# keeping the aspect ratio (kiosks)
+DISPLAY_SCALING = "scaled"
+FULLSCREEN = False
 
-# Speed control - set to True for better performance
-PERFORMANCE_MODE = True
+# Internal resolution relative to WIDTH x HEIGHT, e.g. 0.5 draws a quarter of the
+# pixels on weak hardware. Sprites and screens are scaled once for it (the sprite
+# atlas is cached per resolution); the simulation keeps its logical coordinates
+RENDER_SCALE = 1.0
+
+# Adaptive quality - drops background layers, airplane banners, sound effects
+# and HUD refreshes (quality_governor.QUALITY_TIERS) while frames take
+# longer than FRAME_BUDGET_MS to build, and restores them when there is headroom.
+# Gameplay is the same on every tier. False keeps QUALITY_TIER for the whole run
+ADAPTIVE_QUALITY = True
+QUALITY_TIER = "high"  # high, medium, low, minimal
+FRAME_BUDGET_MS = None  # None = one frame at RENDER_FPS, read by init()
+
+# Longest frame fed into the simulation, so a stall doesn't trigger a burst of catch-up ticks
+MAX_FRAME_SECONDS = 0.25
+
+# Creados por init(): reloj, profiler, nivel de calidad, ventana y lienzo, recursos
+clock = profiler = quality = display = screen = None
+bundle = font = small_font = assets = None
+
+# Publicados por finish_loading() cuando los recursos básicos están listos
+start_screen = parallax = atlas = run_frames = jump_frame = duck_frame = obstacle_images = None
+coin1_image = coin2_image = hud = audio = scores = None
+
+# Coordenada lógica (la de la simulación) -> píxel del lienzo
+def to_canvas(value):
+    return round(value * RENDER_SCALE)
+
+CANVAS_WIDTH, CANVAS_HEIGHT = to_canvas(WIDTH), to_canvas(HEIGHT)
+
+# Alturas de sprites (nombre -> (archivo, altura)) a la resolución del lienzo
+def canvas_sprites(sprites):
+    return {name: (file_name, to_canvas(height)) for name, (file_name, height) in sprites.items()}
 
 # Función para cargar y escalar imágenes manteniendo la proporción
-def load_and_scale(image_path, target_height=None, full_screen=False):
+# No toca la pantalla, así que puede ejecutarse en los hilos de carga
+# Sizes are logical; the image comes out at the canvas resolution
+def scale_image(image_path, target_height=None, full_screen=False):
+    if target_height:
+        target_height = to_canvas(target_height)
     try:
         # Modify path to include asset directory
         full_path = os.path.join(ASSET_DIR, image_path)
         print(f"Loading image from: {full_path}")
         image = pygame.image.load(full_path)
         if full_screen:
-            return pygame.transform.scale(image, (WIDTH, HEIGHT))
+            return pygame.transform.scale(image, (CANVAS_WIDTH, CANVAS_HEIGHT))
         elif target_height:
-            original_width, original_height = image.get_size()
-            scale_factor = target_height / original_height
-            new_width = int(original_width * scale_factor)
-            return pygame.transform.scale(image, (new_width, target_height))
+            return pygame.transform.scale(image, scaled_size(image.get_size(), target_height))
         return image
     except FileNotFoundError:
         print(f"Error: No se encontró la imagen '{full_path}'.")
@@ -45,99 +133,247 @@ def load_and_scale(image_path, target_height=None, full_screen=False):
         placeholder.fill((255, 0, 255))  # Magenta for visibility
         return placeholder
 
-# Cargar recursos del juego
-try:
-    # Load the font with correct path and fallback
+# The result is converted to the display format so blits don't convert pixels every frame;
+# opaque images (backgrounds, screens) use convert() which blits faster than convert_alpha()
+def load_and_scale(image_path, target_height=None, full_screen=False, opaque=False):
+    image = scale_image(image_path, target_height, full_screen)
+    return image.convert() if opaque else image.convert_alpha()
+
+# Load screens with better quality (smoothscale), falling back to normal scaling
+def load_screen(image_path):
     try:
-        font_path = os.path.join(ASSET_DIR, "future-font.TTF")
-        print(f"Loading font from: {font_path}")
-        if os.path.exists(font_path):
-            font = pygame.font.Font(font_path, 36)
-            small_font = pygame.font.Font(font_path, 24)
-        else:
-            print(f"Font file not found, using default font")
-            font = pygame.font.SysFont("Arial", 36)
-            small_font = pygame.font.SysFont("Arial", 24)
+        screen_path = os.path.join(ASSET_DIR, image_path)
+        print(f"Loading high quality screen from: {screen_path}")
+        return pygame.transform.smoothscale(pygame.image.load(screen_path), (CANVAS_WIDTH, CANVAS_HEIGHT))
     except Exception as e:
-        print(f"Error loading custom font: {e}, using default font")
-        font = pygame.font.SysFont("Arial", 36)
-        small_font = pygame.font.SysFont("Arial", 24)
+        print(f"Error loading high quality screen: {e}")
+        return scale_image(image_path, full_screen=True)
+
+# Loader for `name` that reads it from the asset bundle when it has it
+def bundled(name, loader, read=AssetBundle.image):
+    if bundle is not None and name in bundle:
+        return lambda: read(bundle, name)
+    return loader
+
+# PCM from the bundle if the mixer format matches, the .wav file otherwise
+def load_sound(name, file_name):
+    if bundle is not None and name in bundle:
+        sound = bundle.sound(name)
+        if sound is not None:
+            return sound
+    sound_path = os.path.join(ASSET_DIR, file_name)
+    print(f"Loading sound from: {sound_path}")
+    return pygame.mixer.Sound(sound_path)
+
+# Load sounds with correct paths (runs on the audio loader thread)
+def load_sounds():
+    return {
+        "jump": load_sound("jump_sound", "jump_sound.wav"),
+        "run": load_sound("run_sound", "run_sound.wav"),
+        "coin": load_sound("coin_sound", "coin_sound.wav"),
+    }
+
+# Barra de progreso sobre la pantalla de inicio (o en negro hasta que esté lista)
+def draw_loading_progress(loaded, total):
+    pygame.event.pump()
+    if assets.ready("start_screen"):
+        screen.blit(assets.get("start_screen"), (0, 0))
+    else:
+        screen.fill((0, 0, 0))
+    bar = pygame.Rect(CANVAS_WIDTH//4, CANVAS_HEIGHT - to_canvas(40), CANVAS_WIDTH//2, to_canvas(12))
+    pygame.draw.rect(screen, (255, 255, 255), bar, 1)
+    pygame.draw.rect(screen, (255, 255, 255), (bar.x + 2, bar.y + 2, (bar.width - 4) * loaded // max(total, 1), bar.height - 4))
+    display.flip()
+
+# Sonido activo: no desactivado en la configuración y con el mixer inicializado
+def sound_enabled():
+    return SOUND_MODE != "off" and pygame.mixer.get_init() is not None
+
+# Cargar recursos del juego: fuentes ya, imágenes y sonidos en segundo plano
+def load_assets():
+    global bundle, font, small_font, assets
     
-    # Load and scale images
-    # Load start screen with better quality (no scaling to maintain quality)
     try:
-        start_screen_path = os.path.join(ASSET_DIR, "start_screen.png") 
-        print(f"Loading high quality start screen from: {start_screen_path}")
-        start_screen_raw = pygame.image.load(start_screen_path).convert_alpha()
-        # Scale to screen size but use better quality scaling method
-        start_screen = pygame.transform.smoothscale(start_screen_raw, (WIDTH, HEIGHT))
-    except Exception as e:
-        print(f"Error loading high quality start screen: {e}")
-        # Fallback to normal scaling if smoothscale fails
-        start_screen = load_and_scale("start_screen.png", full_screen=True)
-    background = load_and_scale("background.png", HEIGHT)
-    run_frames = [load_and_scale("run_1.png", 120), load_and_scale("run_2.png", 120), load_and_scale("run_3.png", 120)]
-    jump_frame = load_and_scale("jump.png", 120)  # Misma altura que las demás imágenes
-    duck_frame = load_and_scale("duck.png", 60)
-    obstacle_images = [load_and_scale(f"obstacle_{i}.png", 80) for i in range(1, 7)]  # Obstáculos escalados
-    coin1_image = load_and_scale("coin.png", 30)  # Moneda normal (HBD Coins)
-    coin2_image = load_and_scale("coin2.png", 40)  # Moneda especial (HivePower)
-    # Load end screen with better quality (no scaling to maintain quality)
-    try:
-        end_screen_path = os.path.join(ASSET_DIR, "end_screen.png") 
-        print(f"Loading high quality end screen from: {end_screen_path}")
-        end_screen_raw = pygame.image.load(end_screen_path).convert_alpha()
-        # Scale to screen size but use better quality scaling method
-        end_screen = pygame.transform.smoothscale(end_screen_raw, (WIDTH, HEIGHT))
-    except Exception as e:
-        print(f"Error loading high quality end screen: {e}")
-        # Fallback to normal scaling if smoothscale fails
-        end_screen = load_and_scale("end_screen.png", full_screen=True)
-    airplane_banner = load_and_scale("airplane_banner.png", 150)  # Avión con banner (más grande para mejor visibilidad)
-    
-    # Create dummy sound class for when sound is disabled
-    class DummySound:
-        def play(self): pass
+        # The bundle holds assets scaled for the logical resolution
+        bundle = open_bundle(ASSET_BUNDLE) if ASSET_BUNDLE and RENDER_SCALE == 1 else None
     
-    # Load sounds with correct paths with better error handling
-    if ENABLE_SOUND:
+        # Load the font with correct path and fallback
+        font_size, small_font_size = to_canvas(36), to_canvas(24)
         try:
-            jump_sound_path = os.path.join(ASSET_DIR, "jump_sound.wav")
-            print(f"Loading sound from: {jump_sound_path}")
-            jump_sound = pygame.mixer.Sound(jump_sound_path)
-            
-            run_sound_path = os.path.join(ASSET_DIR, "run_sound.wav")
-            print(f"Loading sound from: {run_sound_path}")
-            run_sound = pygame.mixer.Sound(run_sound_path)
-            
-            coin_sound_path = os.path.join(ASSET_DIR, "coin_sound.wav")
-            print(f"Loading sound from: {coin_sound_path}")
-            coin_sound = pygame.mixer.Sound(coin_sound_path)
-            
-            music_path = os.path.join(ASSET_DIR, "background_music.mp3")
-            print(f"Loading music from: {music_path}")
-            pygame.mixer.music.load(music_path)  # Música de fondo
-            pygame.mixer.music.set_volume(0.4)  # Ajustar volumen
-            pygame.mixer.music.play(-1)  # Reproducir en bucle
-            print("Sound enabled and loaded successfully")
+            font_path = os.path.join(ASSET_DIR, "future-font.TTF")
+            if bundle is not None and "font" in bundle:
+                font = pygame.font.Font(bundle.file("font"), font_size)
+                small_font = pygame.font.Font(bundle.file("font"), small_font_size)
+            elif os.path.exists(font_path):
+                print(f"Loading font from: {font_path}")
+                font = pygame.font.Font(font_path, font_size)
+                small_font = pygame.font.Font(font_path, small_font_size)
+            else:
+                print(f"Font file not found, using default font")
+                font = pygame.font.SysFont("Arial", font_size)
+                small_font = pygame.font.SysFont("Arial", small_font_size)
         except Exception as e:
-            print(f"Error loading sound files: {e}")
-            # Use dummy sound objects for error handling
-            jump_sound = run_sound = coin_sound = DummySound()
-    else:
-        print("Sound disabled for better performance")
-        jump_sound = run_sound = coin_sound = DummySound()
-    
-except Exception as e:
-    print(f"Error al cargar recursos: {e}")
-    pygame.quit()
-    sys.exit()
+            print(f"Error loading custom font: {e}, using default font")
+            font = pygame.font.SysFont("Arial", font_size)
+            small_font = pygame.font.SysFont("Arial", small_font_size)
+    
+        # Images are decoded and scaled on a thread pool, sounds on a background thread;
+        # the start screen is queued first so it can be shown while the rest loads
+        # (with a bundle, images are mapped pixels that only need the display conversion)
+        assets = AssetManager(progress=draw_loading_progress)
+        assets.add("start_screen", bundled("start_screen", lambda: load_screen("start_screen.png")),
+                   finalize=pygame.Surface.convert)
+        for i, (file_name, target_height, _, _) in enumerate(PARALLAX_LAYERS):
+            assets.add(os.path.splitext(file_name)[0],
+                       bundled(os.path.splitext(file_name)[0], lambda f=file_name, h=target_height: scale_image(f, h)),
+                       finalize=pygame.Surface.convert if i == 0 else pygame.Surface.convert_alpha)
+        # Sprites come pre-scaled and display-converted from one cached atlas
+        assets.add("atlas", bundled("atlas", lambda: SpriteAtlas.load_raw(canvas_sprites(ATLAS_SPRITES), ASSET_DIR), AssetBundle.atlas),
+                   finalize=SpriteAtlas.from_raw)
+        # At another render scale the simulation still collides with the logical atlas' masks,
+        # built here behind the progress bar instead of when the first game starts
+        if RENDER_SCALE != 1:
+            assets.add("masks", lambda: load_masks(ATLAS_SPRITES, ASSET_DIR))
+        if sound_enabled():
+            assets.add("sounds", load_sounds, audio=True)
+        # Only needed once playing / after the first game
+        assets.add("airplane", bundled("airplane", lambda: SpriteAtlas.load_raw(canvas_sprites(AIRPLANE_SPRITES), ASSET_DIR), AssetBundle.atlas),
+                   finalize=SpriteAtlas.from_raw, lazy=True)
+        assets.add("end_screen", bundled("end_screen", lambda: load_screen("end_screen.png")),
+                   finalize=pygame.Surface.convert, lazy=True)
+    except Exception as e:
+        print(f"Error al cargar recursos: {e}")
+        pygame.quit()
+        sys.exit()
+
+# Initialize only what the game uses (display, fonts and, with sound on, the mixer),
+# open the window and start loading the assets; safe to call more than once
+def init():
+    global clock, profiler, quality, display, screen, CANVAS_WIDTH, CANVAS_HEIGHT
+    
+    if display is not None:
+        return
+    start = time.perf_counter()
+    pygame.display.init()
+    pygame.font.init()
+    if SOUND_MODE != "off":
+        # Mixer con buffer pequeño para baja latencia
+        audio_manager.pre_init()
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            print(f"Audio not available ({e}), continuing without sound")
+    
+    # Reloj para controlar la velocidad del juego
+    clock = pygame.time.Clock()
+    
+    # Profiler de frames (opcional)
+    profiler = FrameProfiler(log_path=PROFILE_LOG) if PROFILE_FRAMES else None
+    if profiler is not None:
+        atexit.register(profiler.close)
+    
+    # Nivel de calidad según el tiempo de frame medido
+    budget_ms = FRAME_BUDGET_MS if FRAME_BUDGET_MS is not None else 1000 / RENDER_FPS
+    quality = QualityGovernor(budget_ms, QUALITY_TIER, ADAPTIVE_QUALITY)
+    
+    # Configuración de la ventana: el juego dibuja en `screen`, que es el lienzo
+    CANVAS_WIDTH, CANVAS_HEIGHT = to_canvas(WIDTH), to_canvas(HEIGHT)
+    display = DisplayScaler((CANVAS_WIDTH, CANVAS_HEIGHT), DISPLAY_SCALING, FULLSCREEN)
+    screen = display.canvas
+    pygame.display.set_caption("Juego de Desplazamiento Lateral")
+    
+    # Solo llegan a la cola los eventos que el juego atiende
+    setup_events()
+    
+    load_assets()
+    print(f"Module imported in {IMPORT_SECONDS * 1000:.0f} ms, game initialized in "
+          f"{(time.perf_counter() - start) * 1000:.0f} ms (assets keep loading in the background)")
+
+# Espera a los recursos básicos (mostrando el progreso) y los publica como globales del módulo
+def finish_loading():
+    global start_screen, parallax, atlas, run_frames, jump_frame, duck_frame, obstacle_images
+    global coin1_image, coin2_image, hud, audio, scores, high_score
+    
+    if hud is not None:
+        return
+    init()
+    try:
+        start = time.perf_counter()
+        assets.wait()
+        start_screen = assets.get("start_screen")
+        # Capas de fondo pre-renderizadas en tiras del formato de la pantalla
+        parallax = Parallax([
+            ParallaxLayer(assets.get(os.path.splitext(file_name)[0]), speed * RENDER_SCALE, to_canvas(y), CANVAS_WIDTH)
+            for file_name, _, y, speed in PARALLAX_LAYERS
+        ])
+        atlas = assets.get("atlas")
+        run_frames = [atlas["run_1"], atlas["run_2"], atlas["run_3"]]
+        jump_frame = atlas["jump"]  # Misma altura que las demás imágenes
+        duck_frame = atlas["duck"]
+        obstacle_images = [atlas[f"obstacle_{i}"] for i in range(1, 7)]  # Obstáculos escalados
+        coin1_image = atlas["coin"]  # Moneda normal (HBD Coins)
+        coin2_image = atlas["coin2"]  # Moneda especial (HivePower)
+        
+        # Capa de HUD con caché de glifos y contadores
+        hud = HUD(font, small_font, coin1_image, coin2_image, RENDER_SCALE)
+        
+        # Load sounds with better error handling
+        music_path = os.path.join(ASSET_DIR, "background_music.mp3")
+        if sound_enabled():
+            try:
+                audio = AudioManager(assets.get("sounds"), SOUND_MODE, music_path)
+                print(f"Sound enabled and loaded successfully ({SOUND_MODE})")
+            except Exception as e:
+                print(f"Error loading sound files: {e}")
+                audio = AudioManager({}, "off")
+        else:
+            print("Sound disabled for better performance")
+            audio = AudioManager({}, "off")
+        if SOUND_MODE == "full":
+            audio.start_music()
+        
+        # Puntuaciones guardadas de todas las partidas (se escriben en segundo plano)
+        scores = ScoreStore(SCORES_DIR)
+        atexit.register(scores.close)
+        high_score = scores.high_score
+        
+        apply_quality()
+        
+        print(f"Assets ready in {time.perf_counter() - start:.2f}s")
+        assets.print_report()
+    except Exception as e:
+        print(f"Error al cargar recursos: {e}")
+        pygame.quit()
+        sys.exit()
+
+# Aplicar el nivel de calidad actual a la parte visual (la simulación no se entera)
+def apply_quality():
+    tier = quality.tier
+    parallax.visible = tier["parallax_layers"]
+    hud.refresh_every = tier["hud_every"]
 
-# Constantes del juego
-GRAVITY = 1
-JUMP_STRENGTH = -16
-GAME_SPEED = 5
-GROUND_HEIGHT = HEIGHT - 40
+# Tamaños reales de los sprites cargados, para que la simulación coincida con lo que se dibuja;
+# el avión se carga de forma diferida, así que su tamaño sale de la cabecera del PNG.
+# At another render scale the surfaces aren't logical sizes, so the simulation
+# gets the header-derived ones (the same sizes the 1.0 atlas would have)
+def sprite_sizes_from_surfaces():
+    sizes = sprite_sizes()
+    if RENDER_SCALE != 1:
+        return sizes
+    sizes.update({
+        "run": run_frames[0].get_size(),
+        "jump": jump_frame.get_size(),
+        "duck": duck_frame.get_size(),
+        "coin": coin1_image.get_size(),
+        "coin2": coin2_image.get_size(),
+    })
+    sizes.update({f"obstacle_{i + 1}": image.get_size() for i, image in enumerate(obstacle_images)})
+    return sizes
+
+# Máscaras de colisión de la simulación: las del atlas dibujado si es el lógico,
+# si no las del atlas lógico, cargadas con el resto de recursos
+def sprite_masks():
+    return atlas.masks if RENDER_SCALE == 1 else assets.get("masks")
 
 # Estado del juego
 game_state = "START"  # START, PLAYING, GAME_OVER
@@ -149,421 +385,222 @@ hive_power = 0  # HivePower counter
 # ====== Resto del código del archivo original a partir de aquí ======
 
 # Función para mostrar la pantalla de inicio
+# La pantalla se muestra en cuanto está lista, con una barra de progreso mientras carga el resto
 def show_start_screen():
+    finish_loading()
     screen.blit(start_screen, (0, 0))
     start_text = font.render("Presiona ESPACIO para comenzar", True, (255, 255, 255))
-    text_rect = start_text.get_rect(center=(WIDTH//2, HEIGHT//2 + 100))
+    text_rect = start_text.get_rect(center=(CANVAS_WIDTH//2, CANVAS_HEIGHT//2 + to_canvas(100)))
     screen.blit(start_text, text_rect)
-    pygame.display.flip()
+    display.flip()
     
-    waiting = True
-    while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    waiting = False
+    # Dormir hasta que se pulse ESPACIO en lugar de sondear la cola
+    if wait_for_key((pygame.K_SPACE,)) is None:
+        pygame.quit()
+        sys.exit()
 
 # Función para mostrar la pantalla de game over
 def show_game_over_screen():
     global high_score
     
-    # Actualizar puntuación máxima si es necesario
-    if score > high_score:
-        high_score = score
-    
-    screen.blit(end_screen, (0, 0))
-    game_over_text = font.render("GAME OVER", True, (255, 255, 255))
-    score_text = font.render(f"Puntuación: {score}", True, (255, 255, 255))
-    high_score_text = font.render(f"Mejor Puntuación: {high_score}", True, (255, 255, 255))
-    
-    # Mostrar HBD Coins y HivePower recolectados
-    hbd_text = small_font.render(f"HBD Coins: {hbd_coins}", True, (0, 200, 0))  # Color verde
-    hive_text = small_font.render(f"HivePower: {hive_power}", True, (220, 20, 60))  # Color rojo carmesí
-    
-    restart_text = font.render("Presiona ESPACIO para reiniciar", True, (255, 255, 255))
-    
-    screen.blit(game_over_text, (WIDTH//2 - game_over_text.get_width()//2, HEIGHT//2 - 120))
-    screen.blit(score_text, (WIDTH//2 - score_text.get_width()//2, HEIGHT//2 - 70))
-    screen.blit(high_score_text, (WIDTH//2 - high_score_text.get_width()//2, HEIGHT//2 - 20))
-    
-    # Mostrar contadores de monedas con sus iconos
-    # HBD Coins
-    screen.blit(pygame.transform.scale(coin1_image, (20, 20)), (WIDTH//2 - 100, HEIGHT//2 + 30))
-    screen.blit(hbd_text, (WIDTH//2 - 70, HEIGHT//2 + 30))
+    # La partida ya está en el registro, así que incluye la puntuación actual
+    high_score = scores.high_score
     
-    # HivePower
-    screen.blit(pygame.transform.scale(coin2_image, (25, 25)), (WIDTH//2 - 100, HEIGHT//2 + 60))
-    screen.blit(hive_text, (WIDTH//2 - 70, HEIGHT//2 + 60))
+    screen.blit(assets.get("end_screen"), (0, 0))
+    hud.draw_game_over(screen, score, high_score, hbd_coins, hive_power)
     
-    screen.blit(restart_text, (WIDTH//2 - restart_text.get_width()//2, HEIGHT//2 + 120))
+    display.flip()
     
-    pygame.display.flip()
-    
-    waiting = True
-    while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    waiting = False
-                    return True
-                elif event.key == pygame.K_ESCAPE:
-                    pygame.quit()
-                    sys.exit()
-    
-    return False
+    if wait_for_key((pygame.K_SPACE, pygame.K_ESCAPE)) == pygame.K_SPACE:
+        return True
+    pygame.quit()
+    sys.exit()
 
-# Clase para el personaje
-class Character:
-    def __init__(self):
-        self.reset()
-        
-    def reset(self):
-        self.x = 100
-        self.y = GROUND_HEIGHT - 120  # Posición inicial sobre el suelo
-        self.vel_y = 0
-        self.is_jumping = False
-        self.is_ducking = False
-        self.run_animation_count = 0
-        self.animation_speed = 5  # Frames entre cambios de animación
-        self.frame_counter = 0
-        self.rect = pygame.Rect(self.x + 20, self.y + 20, 80, 100)  # Colisión ajustada
-    
-    def update(self):
-        # Aplicar gravedad
-        self.vel_y += GRAVITY
-        self.y += self.vel_y
-        
-        # Limitar al suelo
-        if self.y > GROUND_HEIGHT - 120 and not self.is_ducking:
-            self.y = GROUND_HEIGHT - 120
-            self.vel_y = 0
-            self.is_jumping = False
-        
-        # Limitar el personaje agachado al suelo
-        if self.is_ducking:
-            if self.y > GROUND_HEIGHT - 60:  # Posición más baja para agacharse
-                self.y = GROUND_HEIGHT - 60
-                self.vel_y = 0
-                self.is_jumping = False
-        
-        # Actualizar el rectángulo de colisión según el estado
-        if self.is_ducking:
-            self.rect = pygame.Rect(self.x + 20, self.y + 10, 80, 50)  # Colisión más baja al agacharse
-        else:
-            self.rect = pygame.Rect(self.x + 20, self.y + 20, 80, 100)  # Colisión normal
-    
-    def jump(self):
-        if not self.is_jumping and not self.is_ducking:
-            self.vel_y = JUMP_STRENGTH
-            self.is_jumping = True
-            jump_sound.play()
-    
-    def duck(self, ducking):
-        # Si está saltando, no puede agacharse
-        if self.is_jumping:
-            return
-            
-        self.is_ducking = ducking
+# Posición entre el tick anterior y el actual, en píxeles del lienzo;
+# alpha es la fracción de tick ya transcurrida
+def interpolate(previous, current, alpha):
+    return round((previous + (current - previous) * alpha) * RENDER_SCALE)
+
+# Funciones para dibujar el estado de la simulación (devuelven el rectángulo dibujado)
+def draw_character(character, alpha=1.0):
+    x, y = to_canvas(character.x), interpolate(character.prev_y, character.y, alpha)
+    if character.is_jumping:
+        return screen.blit(jump_frame, (x, y))
+    elif character.is_ducking:
+        return screen.blit(duck_frame, (x, y))
+    else:
+        return screen.blit(run_frames[character.run_animation_count], (x, y))
+
+def draw_obstacle(obstacle, alpha=1.0):
+    x = interpolate(obstacle.prev_x, obstacle.x, alpha)
+    image = obstacle_images[obstacle.image_idx]
+    return screen.blit(image, (x, to_canvas(GROUND_HEIGHT) - image.get_height()))
+
+def draw_coin(coin, alpha=1.0):
+    if not coin.collected:
+        x = interpolate(coin.prev_x, coin.x, alpha)
+        return screen.blit(coin2_image if coin.special else coin1_image, (x, to_canvas(coin.y)))
+
+def draw_rain_coins(store, alpha=1.0):
+    # Solo las monedas visibles; el resto de la lluvia sigue fuera de la pantalla
+    xs = (store.prev_x + (store.x - store.prev_x) * alpha) * RENDER_SCALE
+    visible = xs < CANVAS_WIDTH
+    special = (store.flags[visible] & FLAG_SPECIAL) != 0
+    return [
+        screen.blit(coin2_image if is_special else coin1_image, (round(x), y))
+        for x, y, is_special in zip(xs[visible].tolist(), (store.y[visible] * RENDER_SCALE).tolist(), special.tolist())
+    ]
+
+def draw_airplane(airplane, alpha=1.0):
+    x = interpolate(airplane.prev_x, airplane.x, alpha)
+    return screen.blit(assets.get("airplane")["airplane_banner"], (x, to_canvas(airplane.y)))
+
+# Sonidos asociados a los eventos que emite la simulación
+def play_sounds(events):
+    if quality.tier["sound_effects"]:
+        audio.play_cues(events)
+
+# Dibujar un frame completo de la partida (sin presentarlo en pantalla)
+def draw_scene(sim, renderer, alpha=1.0):
+    def draw_backdrop(surface):
+        parallax.draw(surface)
         
-        # Reproducir sonido al agacharse/levantarse
-        if ducking:
-            run_sound.play()
-    
-    def draw(self):
-        if self.is_jumping:
-            screen.blit(jump_frame, (self.x, self.y))
-        elif self.is_ducking:
-            screen.blit(duck_frame, (self.x, self.y))
-        else:
-            # Animación de correr
-            self.frame_counter += 1
-            if self.frame_counter >= self.animation_speed:
-                self.run_animation_count = (self.run_animation_count + 1) % 3
-                self.frame_counter = 0
-                
-                # Reproducir sonido de correr en cada cambio de frame
-                if self.run_animation_count == 0:
-                    run_sound.play()
-                    
-            screen.blit(run_frames[self.run_animation_count], (self.x, self.y))
-
-# Clase para los obstáculos
-class Obstacle:
-    def __init__(self, x, image_idx=None):
-        self.x = x
-        # Si no se especifica un índice de imagen, elegir uno aleatorio
-        if image_idx is None:
-            self.image_idx = random.randint(0, 5)
-        else:
-            self.image_idx = image_idx
-        self.image = obstacle_images[self.image_idx]
-        self.width = self.image.get_width()
-        self.height = self.image.get_height()
-        self.rect = pygame.Rect(self.x, GROUND_HEIGHT - self.height, self.width, self.height)
-    
-    def update(self):
-        self.x -= GAME_SPEED
-        self.rect.x = self.x
-    
-    def draw(self):
-        screen.blit(self.image, (self.x, GROUND_HEIGHT - self.height))
-    
-    def is_off_screen(self):
-        return self.x + self.width < 0
-
-# Clase para monedas (HBD Coins y HivePower)
-class Coin:
-    def __init__(self, x, y, special=False):
-        self.x = x
-        self.y = y
-        self.special = special  # True = HivePower (roja), False = HBD Coin (amarilla)
-        self.coin_type = "HivePower" if special else "HBD Coin"
-        self.image = coin2_image if special else coin1_image
-        self.width = self.image.get_width()
-        self.height = self.image.get_height()
-        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
-        self.collected = False
-        self.value = 5 if special else 1  # HivePower vale más puntos que las HBD Coins
-    
-    def update(self):
-        self.x -= GAME_SPEED
-        self.rect.x = self.x
-    
-    def draw(self):
-        if not self.collected:
-            screen.blit(self.image, (self.x, self.y))
-    
-    def is_off_screen(self):
-        return self.x + self.width < 0
-
-# Clase para el avión con el banner
-class Airplane:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.image = airplane_banner
-        self.speed = 3  # Más lento que los obstáculos
-        self.width = self.image.get_width()
-        self.height = self.image.get_height()
-        self.passed = False
-    
-    def update(self):
-        self.x -= self.speed
-    
-    def draw(self):
-        screen.blit(self.image, (self.x, self.y))
-    
-    def is_off_screen(self):
-        return self.x + self.width < 0
+        # Dibujar línea del suelo
+        ground = to_canvas(GROUND_HEIGHT)
+        pygame.draw.line(surface, (83, 56, 70), (0, ground), (CANVAS_WIDTH, ground), max(1, to_canvas(2)))
+    
+    renderer.begin_frame(parallax.moved, draw_backdrop)
+    if profiler is not None:
+        profiler.mark("background")
+    
+    # Dibujar obstáculos
+    for obstacle in sim.obstacles:
+        renderer.add(draw_obstacle(obstacle, alpha))
+    
+    # Dibujar monedas
+    for coin in sim.coins:
+        renderer.add(draw_coin(coin, alpha))
+    if sim.rain_coins.count:
+        renderer.add(draw_rain_coins(sim.rain_coins, alpha))
+    
+    # Dibujar aviones (los niveles bajos de calidad omiten las pancartas)
+    if quality.tier["airplanes"]:
+        for airplane in sim.airplanes:
+            renderer.add(draw_airplane(airplane, alpha))
+    
+    # Dibujar personaje
+    renderer.add(draw_character(sim.character, alpha))
+    if profiler is not None:
+        profiler.mark("draw")
+    
+    # Mostrar puntuación y contadores de monedas (solo se re-renderizan al cambiar)
+    renderer.add(hud.draw(screen, sim.score, sim.hbd_coins, sim.hive_power))
+    if profiler is not None:
+        renderer.add(profiler.draw_overlay(screen))
+        profiler.mark("hud")
 
 # Función principal del juego
 def main_game():
     global game_state, score, hbd_coins, hive_power
     
-    # Reiniciar puntuación y contadores de monedas
-    score = 0
-    hbd_coins = 0
-    hive_power = 0
-    
-    # Crear objetos del juego
-    character = Character()
-    obstacles = []
-    coins = []
-    airplanes = []
-    
-    # Contadores y temporizadores
-    obstacle_timer = 0
-    coin_timer = 0
-    airplane_timer = 0
-    score_timer = 0
-    last_special_coin = 0  # Tiempo desde la última moneda especial
-    
-    # Variables para controlar la dificultad
-    game_speed_increase = 0.001  # Incremento gradual de velocidad
-    current_game_speed = GAME_SPEED
-    background_x = 0  # Para el scroll del fondo
+    finish_loading()
+    # Los recursos diferidos se cargan en segundo plano mientras se juega
+    assets.prefetch("airplane", "end_screen")
+    audio.start_music()  # Solo hace algo la primera vez (modo "light")
+    
+    # La lógica del juego vive en GameSimulation; aquí solo se dibuja y se leen eventos
+    # Semilla explícita para que la partida se pueda reproducir
+    seed = random.randrange(2**31)
+    sim = GameSimulation(seed=seed, sizes=sprite_sizes_from_surfaces(), difficulty=DIFFICULTY,
+                         coin_rain=COIN_RAIN, profiler=profiler, masks=sprite_masks())
+    recorder = InputRecorder(sim) if RECORD_REPLAYS else None
+    keys = InputQueue(sim.character, recorder)
+    parallax.reset()  # Fondo desde el principio en cada partida
+    renderer = DirtyRectRenderer(screen, enabled=DIRTY_RECT_MODE, display=display)
+    hud.reset()
+    quality.reset()  # Los frames del menú no cuentan para el presupuesto
+    accumulator = 0.0  # Tiempo real pendiente de simular
+    clock.tick()  # Descartar el tiempo pasado en el menú
     
     # Bucle principal del juego
     running = True
     while running:
-        # Control de eventos
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE or event.key == pygame.K_UP:
-                    character.jump()
-                elif event.key == pygame.K_DOWN:
-                    character.duck(True)
-            
-            if event.type == pygame.KEYUP:
-                if event.key == pygame.K_DOWN:
-                    character.duck(False)
-        
-        # Actualizar el personaje
-        character.update()
-        
-        # Performance mode makes the game run faster
-        if PERFORMANCE_MODE:
-            # Skip some frames for better performance
-            pygame.time.delay(10)  # Reduce CPU usage
-            
-            # Make obstacles and coins appear less frequently but move faster
-            current_game_speed = GAME_SPEED * 1.5
-        else:
-            # Normal speed mode
-            # Aumentar la velocidad del juego progresivamente
-            current_game_speed += game_speed_increase
-        
-        # Generar obstáculos periódicamente
-        obstacle_timer += 1
-        if obstacle_timer >= random.randint(60, 120):  # Entre 1 y 2 segundos a 60 FPS
-            new_x = WIDTH + random.randint(50, 150)
-            obstacles.append(Obstacle(new_x))
-            obstacle_timer = 0
+        frame_start = time.perf_counter()
+        if profiler is not None:
+            profiler.begin_frame()
         
-        # Generar monedas periódicamente
-        coin_timer += 1
-        if coin_timer >= random.randint(30, 90):  # Entre 0.5 y 1.5 segundos
-            new_x = WIDTH + random.randint(20, 100)
-            new_y = random.randint(GROUND_HEIGHT - 100, GROUND_HEIGHT - 40)  # Altura variable
-            
-            # Decidir si es una moneda especial (más rara)
-            special = False
-            if last_special_coin > 600:  # Al menos 10 segundos desde la última moneda especial
-                special = random.random() < 0.2  # 20% de probabilidad
-                if special:
-                    last_special_coin = 0
-            
-            coins.append(Coin(new_x, new_y, special))
-            coin_timer = 0
+        # Control de eventos: una sola lectura de la cola por frame
+        for key in keys.poll():
+            if key == pygame.K_F3 and profiler is not None:
+                profiler.toggle_overlay()
+        if keys.quit:
+            pygame.quit()
+            sys.exit()
+        if profiler is not None:
+            profiler.mark("events")
         
-        last_special_coin += 1
-        
-        # Generar aviones con banner ocasionalmente (más frecuente ahora)
-        airplane_timer += 1
-        if airplane_timer >= random.randint(200, 400):  # Mucho más frecuente para mejor visibilidad
-            new_x = WIDTH + 100
-            new_y = random.randint(50, 150)  # Altura aleatoria pero por la parte superior
-            airplanes.append(Airplane(new_x, new_y))
-            airplane_timer = 0
-        
-        # Actualizar obstáculos y comprobar colisiones
-        for obstacle in obstacles[:]:
-            obstacle.update()
-            
-            # Comprobar colisión con el personaje
-            if character.rect.colliderect(obstacle.rect):
+        # Avanzar la lógica en ticks fijos, tantos como quepan en el tiempo transcurrido
+        while accumulator >= TICK_SECONDS and running:
+            accumulator -= TICK_SECONDS
+            # Las teclas llegadas desde el último tick se aplican juntas antes del siguiente
+            if keys.pending:
+                keys.apply()
+            if not sim.step():
                 game_state = "GAME_OVER"
                 running = False
+                scores.submit(sim.score, sim.hbd_coins, sim.hive_power, sim.frame / TICK_RATE, seed)
+                if recorder is not None:
+                    recorder.save(os.path.join(RECORD_REPLAYS, f"replay_{time.strftime('%Y%m%d_%H%M%S')}_{seed}.json"))
             
-            if obstacle.is_off_screen():
-                obstacles.remove(obstacle)
-        
-        # Actualizar monedas y comprobar colecciones
-        for coin in coins[:]:
-            coin.update()
-            
-            # Comprobar si el personaje recoge la moneda
-            if not coin.collected and character.rect.colliderect(coin.rect):
-                coin.collected = True
-                score += coin.value
-                
-                # Incrementar contador específico según el tipo de moneda
-                if coin.special:
-                    hive_power += 1  # HivePower (moneda especial)
-                else:
-                    hbd_coins += 1  # HBD Coins (moneda normal)
-                    
-                coin_sound.play()
-            
-            if coin.is_off_screen() or coin.collected:
-                coins.remove(coin)
-        
-        # Actualizar aviones
-        for airplane in airplanes[:]:
-            airplane.update()
-            
-            # Marcar si el avión ha pasado por la pantalla (para dar puntos)
-            if not airplane.passed and airplane.x < character.x:
-                airplane.passed = True
-                score += 2  # Puntos por pasar por debajo del avión
-            
-            if airplane.is_off_screen():
-                airplanes.remove(airplane)
-        
-        # Aumentar la puntuación con el tiempo
-        score_timer += 1
-        if score_timer >= 30:  # Cada medio segundo
-            score += 1
-            score_timer = 0
+            # Fondo con parallax scrolling
+            if SCROLL_BACKGROUND:
+                parallax.scroll(sim.current_game_speed)
+        score, hbd_coins, hive_power = sim.score, sim.hbd_coins, sim.hive_power
+        play_sounds(sim.events)
+        sim.events.clear()
+        if profiler is not None:
+            profiler.mark("sound")
         
         # ===== Dibujar escena =====
         
-        # Fondo con parallax scrolling
-        background_x -= current_game_speed * 0.5  # Más lento que los obstáculos
-        if background_x <= -background.get_width():
-            background_x = 0
-            
-        screen.blit(background, (background_x, 0))
-        screen.blit(background, (background_x + background.get_width(), 0))
-        
-        # Dibujar línea del suelo
-        pygame.draw.line(screen, (83, 56, 70), (0, GROUND_HEIGHT), (WIDTH, GROUND_HEIGHT), 2)
-        
-        # Dibujar obstáculos
-        for obstacle in obstacles:
-            obstacle.draw()
-        
-        # Dibujar monedas
-        for coin in coins:
-            coin.draw()
+        # Fracción del siguiente tick ya transcurrida, para interpolar las posiciones
+        alpha = 1.0 if not running else accumulator / TICK_SECONDS
+        draw_scene(sim, renderer, alpha)
         
-        # Dibujar aviones
-        for airplane in airplanes:
-            airplane.draw()
+        # Actualizar pantalla (flip completo o solo los rectángulos modificados)
+        renderer.present()
+        if profiler is not None:
+            profiler.mark("flip")
         
-        # Dibujar personaje
-        character.draw()
+        # Ajustar la calidad según lo que costó el frame (sin contar la espera del limitador)
+        if quality.record(time.perf_counter() - frame_start):
+            apply_quality()
+            renderer.invalidate()
         
-        # Mostrar puntuación y contadores de monedas
-        score_text = font.render(f"Score: {score}", True, (255, 255, 255))
-        screen.blit(score_text, (20, 20))
-        
-        # Mostrar contadores de monedas HBD y HivePower con sus iconos
-        # HBD Coins (verde)
-        screen.blit(pygame.transform.scale(coin1_image, (20, 20)), (20, 60))
-        hbd_text = small_font.render(f"HBD: {hbd_coins}", True, (0, 200, 0))  # Color verde
-        screen.blit(hbd_text, (50, 60))
-        
-        # HivePower (rojas)
-        screen.blit(pygame.transform.scale(coin2_image, (25, 25)), (20, 90))
-        hive_text = small_font.render(f"HivePower: {hive_power}", True, (220, 20, 60))  # Color rojo carmesí
-        screen.blit(hive_text, (50, 90))
+        # Limitar la velocidad de dibujado y acumular el tiempo real transcurrido
+        accumulator += min(clock.tick(RENDER_FPS) / 1000.0, MAX_FRAME_SECONDS)
+        if profiler is not None:
+            profiler.mark("tick_wait")
+            profiler.end_frame()
+
+# Bucle principal: menú, partida y game over
+def main():
+    global game_state
+    
+    init()
+    while True:
+        if game_state == "START":
+            show_start_screen()
+            game_state = "PLAYING"
         
-        # Actualizar pantalla
-        pygame.display.flip()
+        elif game_state == "PLAYING":
+            main_game()
         
-        # Controlar velocidad del juego
-        clock.tick(60)
-
-# Bucle principal
-while True:
-    if game_state == "START":
-        show_start_screen()
-        game_state = "PLAYING"
-    
-    elif game_state == "PLAYING":
-        main_game()
-    
-    elif game_state == "GAME_OVER":
-        if show_game_over_screen():
-            game_state = "PLAYING"
\ No newline at end of file
+        elif game_state == "GAME_OVER":
+            if show_game_over_screen():
+                game_state = "PLAYING"
+
+IMPORT_SECONDS = time.perf_counter() - _import_start
+
+if __name__ == "__main__":
+    main()
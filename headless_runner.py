@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Headless Runner - Plays N seeded games back to back with GameSimulation
+No window, sound or frame limiter: used for balancing and regression runs.
+The collision masks come from the cached sprite atlas; the first run on a cold
+cache (.sprite_cache) spends about 2 s building it from the source PNGs
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from difficulty import PROFILES
+from game_simulation import GameSimulation, sprite_sizes
+
+
+def jump_when_near(sim, distance=40):
+    """Simple bot: jump as soon as the next obstacle is within `distance` pixels."""
+    front = sim.sprite_box.right  # Borde derecho del sprite actual del personaje
+    character = sim.character
+    for obstacle in sim.obstacles:
+        gap = obstacle.x - front
+        if 0 <= gap <= distance:
+            character.jump()
+            return
+
+
+def never_jump(sim):
+    """Baseline bot: runs straight into the first obstacle."""
+
+
+def random_jumps(sim, chance=0.05):
+    """Bot that jumps at random (seeded from the game), for a luck baseline."""
+    if sim.frame == 0:
+        sim.policy_rng = random.Random(sim.seed)
+    if sim.policy_rng.random() < chance:
+        sim.character.jump()
+
+
+# Bots by name, for the command-line tools: name -> (policy, name of its numeric parameter)
+POLICIES = {
+    "jump_when_near": (jump_when_near, "distance"),
+    "random_jumps": (random_jumps, "chance"),
+    "never_jump": (never_jump, None),
+}
+
+
+def make_policy(spec):
+    """Policy from a "name" or "name:value" spec, e.g. "jump_when_near:60"."""
+    name, _, value = spec.partition(":")
+    if name not in POLICIES:
+        raise ValueError(f"unknown policy {name!r}, expected one of {', '.join(POLICIES)}")
+    policy, parameter = POLICIES[name]
+    if not value:
+        return policy
+    if parameter is None:
+        raise ValueError(f"policy {name!r} takes no parameter")
+    value = float(value)
+
+    def configured(sim):
+        policy(sim, value)
+    return configured
+
+
+def play_game(sim, seed, policy=jump_when_near, max_frames=36000):
+    """Reset `sim` to `seed` and play until the character crashes or `max_frames` is reached.
+
+    Reusing one GameSimulation for every game keeps its entity pools warm.
+    """
+    sim.reset(seed)
+    while sim.frame < max_frames:
+        policy(sim)
+        running = sim.step()
+        sim.events.clear()
+        if not running:
+            break
+    return {
+        "seed": seed,
+        "frames": sim.frame,
+        "score": sim.score,
+        "hbd_coins": sim.hbd_coins,
+        "hive_power": sim.hive_power,
+        "crashed": sim.game_over,
+        "allocations": sim.allocations,  # Constructed by `sim` so far, over every game it played
+    }
+
+
+def run_games(count, first_seed=0, policy=jump_when_near, max_frames=36000, difficulty="classic",
+              coin_rain=0):
+    """Play `count` games with consecutive seeds and return one result dict per game."""
+    sim = GameSimulation(sizes=sprite_sizes(), difficulty=difficulty, coin_rain=coin_rain)
+    return [play_game(sim, seed, policy, max_frames) for seed in range(first_seed, first_seed + count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play seeded Dino Puku games without a display.")
+    parser.add_argument("-n", "--games", type=int, default=100, help="number of games to play")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--max-frames", type=int, default=36000, help="frame cap per game (60 per second)")
+    parser.add_argument("--difficulty", default="classic", choices=PROFILES, help="difficulty profile")
+    parser.add_argument("--coin-rain", type=int, default=0, metavar="N",
+                        help="stress test: drop N coins every coin rain event")
+    parser.add_argument("--policy", default="jump_when_near",
+                        help=f"bot playing the games, \"name\" or \"name:value\" ({', '.join(POLICIES)})")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print every game")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run_games(args.games, args.seed, make_policy(args.policy), max_frames=args.max_frames,
+                        difficulty=args.difficulty, coin_rain=args.coin_rain)
+    elapsed = time.perf_counter() - start
+
+    if args.verbose:
+        for result in results:
+            print(f"seed={result['seed']} frames={result['frames']} score={result['score']} "
+                  f"hbd={result['hbd_coins']} hive={result['hive_power']}")
+
+    total_frames = sum(result["frames"] for result in results)
+    mean_score = sum(result["score"] for result in results) / max(len(results), 1)
+    print(f"{len(results)} games, {total_frames} frames in {elapsed:.2f}s "
+          f"({total_frames / max(elapsed, 1e-9):.0f} frames/s), mean score {mean_score:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
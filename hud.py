@@ -0,0 +1,149 @@
+"""
+HUD - Cached text and icon rendering for the score and coin counters
+Glyphs are rendered once per font and color, and a counter is only recomposed
+when its value changes, so a steady frame does no font rendering at all.
+Layout coordinates are for the 800x450 logical screen and multiplied by `scale`
+when drawing into a smaller or larger canvas (fonts come already sized)
+"""
+import pygame
+
+from sprite_atlas import copy_blit
+
+WHITE = (255, 255, 255)
+GREEN = (0, 200, 0)  # HBD Coins
+CRIMSON = (220, 20, 60)  # HivePower
+
+
+class GlyphCache:
+    """Renders text for one font and color, reusing the surface of every glyph and string seen."""
+
+    def __init__(self, font, color):
+        self.font = font
+        self.color = color
+        self._glyphs = {}
+        self._texts = {}
+
+    def glyph(self, char):
+        surface = self._glyphs.get(char)
+        if surface is None:
+            surface = self._glyphs[char] = self.font.render(char, True, self.color)
+        return surface
+
+    def text(self, text):
+        """Whole-string render for static labels (keeps the font's kerning)."""
+        surface = self._texts.get(text)
+        if surface is None:
+            surface = self._texts[text] = self.font.render(text, True, self.color)
+        return surface
+
+    def compose(self, label, value):
+        """Label rendered as a whole, followed by the digits of `value` taken from the glyph cache."""
+        parts = [self.text(label)] + [self.glyph(char) for char in str(value)]
+        width = sum(part.get_width() for part in parts)
+        height = max(part.get_height() for part in parts)
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        x = 0
+        for part in parts:
+            copy_blit(surface, part, (x, 0))
+            x += part.get_width()
+        return surface
+
+
+class Counter:
+    """A "label: value" text that is only recomposed when its value changes."""
+
+    def __init__(self, glyphs, label):
+        self.glyphs = glyphs
+        self.label = label
+        self.value = None
+        self.surface = None
+
+    def render(self, value):
+        if value != self.value or self.surface is None:
+            self.value = value
+            self.surface = self.glyphs.compose(self.label, value)
+        return self.surface
+
+
+class HUD:
+    """Score/coin overlay for main_game() and the game over screen."""
+
+    def __init__(self, font, small_font, coin1_image, coin2_image, scale=1.0):
+        self.scale = scale
+        self.large = GlyphCache(font, WHITE)
+        self.small_green = GlyphCache(small_font, GREEN)
+        self.small_crimson = GlyphCache(small_font, CRIMSON)
+
+        # Miniaturas de los iconos, escaladas una sola vez
+        self.hbd_icon = pygame.transform.scale(coin1_image, (self._px(20), self._px(20)))
+        self.hive_icon = pygame.transform.scale(coin2_image, (self._px(25), self._px(25)))
+
+        # Contadores durante la partida
+        self.score = Counter(self.large, "Score: ")
+        self.hbd = Counter(self.small_green, "HBD: ")
+        self.hive = Counter(self.small_crimson, "HivePower: ")
+
+        # Contadores de la pantalla de game over
+        self.final_score = Counter(self.large, "Puntuación: ")
+        self.final_high_score = Counter(self.large, "Mejor Puntuación: ")
+        self.final_hbd = Counter(self.small_green, "HBD Coins: ")
+        self.final_hive = Counter(self.small_crimson, "HivePower: ")
+
+        # Posiciones de la partida, ya escaladas
+        self.score_pos = (self._px(20), self._px(20))
+        self.hbd_icon_pos = (self._px(20), self._px(60))
+        self.hbd_pos = (self._px(50), self._px(60))
+        self.hive_icon_pos = (self._px(20), self._px(90))
+        self.hive_pos = (self._px(50), self._px(90))
+
+        # Frames between updates of the in-game counter values (1 = every frame)
+        self.refresh_every = 1
+        self._frames = 0
+        self._shown = None
+
+    def _px(self, value):
+        return round(value * self.scale)
+
+    def reset(self):
+        """Show the next values passed to draw() right away (new game)."""
+        self._shown = None
+
+    def draw(self, surface, score, hbd_coins, hive_power):
+        """Draw the in-game counters; returns the rects that were drawn.
+
+        The values shown are only updated every `refresh_every` calls."""
+        self._frames += 1
+        if self._shown is None or self._frames >= self.refresh_every:
+            self._frames = 0
+            self._shown = (score, hbd_coins, hive_power)
+        score, hbd_coins, hive_power = self._shown
+        return [
+            # Mostrar puntuación
+            surface.blit(self.score.render(score), self.score_pos),
+            # HBD Coins (verde)
+            surface.blit(self.hbd_icon, self.hbd_icon_pos),
+            surface.blit(self.hbd.render(hbd_coins), self.hbd_pos),
+            # HivePower (rojas)
+            surface.blit(self.hive_icon, self.hive_icon_pos),
+            surface.blit(self.hive.render(hive_power), self.hive_pos),
+        ]
+
+    def draw_game_over(self, surface, score, high_score, hbd_coins, hive_power):
+        """Draw the texts and counters of the game over screen."""
+        width, height = surface.get_size()
+        px = self._px
+
+        def centered(text_surface, y):
+            surface.blit(text_surface, (width//2 - text_surface.get_width()//2, height//2 + px(y)))
+
+        centered(self.large.text("GAME OVER"), -120)
+        centered(self.final_score.render(score), -70)
+        centered(self.final_high_score.render(high_score), -20)
+
+        # Mostrar contadores de monedas con sus iconos
+        surface.blit(self.hbd_icon, (width//2 - px(100), height//2 + px(30)))
+        surface.blit(self.final_hbd.render(hbd_coins), (width//2 - px(70), height//2 + px(30)))
+        surface.blit(self.hive_icon, (width//2 - px(100), height//2 + px(60)))
+        surface.blit(self.final_hive.render(hive_power), (width//2 - px(70), height//2 + px(60)))
+
+        centered(self.large.text("Presiona ESPACIO para reiniciar"), 120)
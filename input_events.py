@@ -0,0 +1,69 @@
+"""
+Input Events - Event filtering, blocking menu waits and a per-tick key queue
+Only the event types the game handles reach the SDL queue (set_allowed), so
+mouse motion, joystick or text events never wake the game up or pile up. Menus
+sleep in pygame.event.wait instead of polling, and the game loop drains the
+queue once per frame into an InputQueue whose keys are applied together right
+before the next simulation tick, which is also the tick the replay records
+"""
+import pygame
+
+from replay import KEY_NAMES, handle_key
+
+# Tipos de evento que el juego atiende; los demás se descartan en SDL
+ALLOWED_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.VIDEOEXPOSE)
+
+# Longest single wait on a menu; waking up now and then keeps Ctrl+C working
+MENU_WAIT_MS = 500
+
+
+def setup_events():
+    """Block every event type except ALLOWED_EVENTS (needs pygame.display initialized)."""
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(ALLOWED_EVENTS)
+    pygame.event.clear()
+
+
+def wait_for_key(keys, timeout_ms=MENU_WAIT_MS):
+    """Sleep until one of `keys` is pressed and return it, or None if the window is closed.
+
+    Uses no CPU while idle; an exposed window gets the last frame flipped again."""
+    while True:
+        event = pygame.event.wait(timeout_ms)
+        if event.type == pygame.QUIT:
+            return None
+        if event.type == pygame.KEYDOWN and event.key in keys:
+            return event.key
+        if event.type == pygame.VIDEOEXPOSE:
+            pygame.display.flip()
+
+
+class InputQueue:
+    """Key events of the game loop, collected once per frame and applied once per tick."""
+
+    def __init__(self, character, recorder=None):
+        self.character = character
+        self.recorder = recorder
+        self.pending = []  # (event type, key) of game keys not applied yet
+        self.quit = False
+
+    def poll(self):
+        """Drain the SDL queue; returns the KEYDOWN keys that aren't game keys (F3...)."""
+        other_keys = []
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.quit = True
+            elif event.type == pygame.KEYDOWN or event.type == pygame.KEYUP:
+                if event.key in KEY_NAMES:
+                    self.pending.append((event.type, event.key))
+                elif event.type == pygame.KEYDOWN:
+                    other_keys.append(event.key)
+        return other_keys
+
+    def apply(self):
+        """Feed the pending keys to the character, in order, before the next tick."""
+        for event_type, key in self.pending:
+            # Saltar con ESPACIO/ARRIBA, agacharse con ABAJO; se graban con el tick en que se aplican
+            if handle_key(self.character, event_type, key) and self.recorder is not None:
+                self.recorder.record(event_type, key)
+        self.pending.clear()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Leaderboard Server - asyncio HTTP server for the web pages and a JSON leaderboard API
+Replaces `python -m http.server`: index.html and web_version.html are served
+from memory with ETags (a matching If-None-Match gets a 304), and cabinets and
+browsers share a leaderboard backed by a ScoreStore, whose writer thread
+batches the appends. Keep-alive connections are served concurrently on one
+event loop.
+
+API:
+  POST /api/scores          {"player", "score", "hbd_coins", "hive_power", "duration", "seed"}
+  GET  /api/top?n=10        best games, highest score first
+  GET  /api/best/<player>   best game of one player
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from score_store import ScoreStore
+
+# Pages served from memory: URL path -> file
+PAGES = {
+    "/": "index.html",
+    "/index.html": "index.html",
+    "/web_version.html": "web_version.html",
+}
+
+CONTENT_TYPES = {".html": "text/html; charset=utf-8"}
+
+# Separate from the game's own scores/ directory: one ScoreStore per directory
+LEADERBOARD_DIR = "leaderboard"
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 4 * 1024
+KEEPALIVE_SECONDS = 15
+MAX_PLAYER_LENGTH = 32
+MAX_TOP = 100
+
+# Seconds between checks of the page files for changes
+RELOAD_SECONDS = 2.0
+
+REASONS = {200: "OK", 201: "Created", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 431: "Request Header Fields Too Large"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message=None):
+        super().__init__(message or REASONS[status])
+        self.status = status
+
+
+class PageCache:
+    """Page bodies and ETags kept in memory, re-read only when a file's mtime changes."""
+
+    def __init__(self, root):
+        self.root = root
+        self._pages = {}  # file -> (mtime_ns, body, etag)
+        self._checked = 0.0
+
+    def get(self, file_name):
+        now = time.monotonic()
+        if now - self._checked > RELOAD_SECONDS:
+            self._checked = now
+            for name in set(PAGES.values()):
+                self._refresh(name)
+        return self._pages.get(file_name)
+
+    def _refresh(self, file_name):
+        path = os.path.join(self.root, file_name)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            cached = self._pages.get(file_name)
+            if cached is not None and cached[0] == mtime:
+                return
+            with open(path, "rb") as f:
+                body = f.read()
+        except OSError:
+            self._pages.pop(file_name, None)
+            return
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        self._pages[file_name] = (mtime, body, etag)
+
+
+class LeaderboardServer:
+    def __init__(self, store, root="."):
+        self.store = store
+        self.pages = PageCache(root)
+        self.requests = 0
+
+    # ----- HTTP -----
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), KEEPALIVE_SECONDS)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                try:
+                    status, response_headers, payload = self.route(method, target, headers, body)
+                except HttpError as e:
+                    status, response_headers, payload = self._json(e.status, {"error": str(e)})
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self._write_response(writer, status, response_headers, payload, method == "HEAD", keep_alive)
+                await writer.drain()
+                self.requests += 1
+                if not keep_alive:
+                    break
+        except HttpError as e:
+            # Malformed request: answer once and drop the connection
+            status, response_headers, payload = self._json(e.status, {"error": str(e)})
+            self._write_response(writer, status, response_headers, payload, False, False)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.LimitOverrunError:
+            raise HttpError(431)
+        except asyncio.IncompleteReadError as e:
+            if not e.partial:
+                return None  # Closed between requests
+            raise
+        if len(head) > MAX_HEADER_BYTES:
+            raise HttpError(431)
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            raise HttpError(400, "bad Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413)
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+
+    @staticmethod
+    def _write_response(writer, status, headers, payload, head_only, keep_alive):
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+        headers = dict(headers)
+        headers["Content-Length"] = str(len(payload))
+        headers["Connection"] = "keep-alive" if keep_alive else "close"
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if not head_only and status != 304:
+            writer.write(payload)
+
+    @staticmethod
+    def _json(status, data):
+        # allow_nan=False: Infinity/NaN aren't JSON and would break JSON.parse in the page
+        payload = json.dumps(data, allow_nan=False).encode("utf-8")
+        return status, {"Content-Type": "application/json", "Cache-Control": "no-store"}, payload
+
+    # ----- Rutas -----
+
+    def route(self, method, target, headers, body):
+        url = urlsplit(target)
+        path = unquote(url.path)
+        if path in PAGES:
+            if method not in ("GET", "HEAD"):
+                raise HttpError(405)
+            return self.page(PAGES[path], headers)
+        if path == "/api/scores":
+            if method != "POST":
+                raise HttpError(405)
+            return self.submit(body)
+        if path == "/api/top":
+            if method not in ("GET", "HEAD"):
+                raise HttpError(405)
+            query = parse_qs(url.query)
+            try:
+                n = min(MAX_TOP, max(1, int(query.get("n", ["10"])[0])))
+            except ValueError:
+                raise HttpError(400, "n must be an integer")
+            return self._json(200, self.store.top(n))
+        if path.startswith("/api/best/"):
+            if method not in ("GET", "HEAD"):
+                raise HttpError(405)
+            record = self.store.best(path[len("/api/best/"):])
+            if record is None:
+                raise HttpError(404, "no games for this player")
+            return self._json(200, record)
+        raise HttpError(404)
+
+    def page(self, file_name, headers):
+        cached = self.pages.get(file_name)
+        if cached is None:
+            raise HttpError(404)
+        _, body, etag = cached
+        response_headers = {
+            "Content-Type": CONTENT_TYPES.get(os.path.splitext(file_name)[1], "application/octet-stream"),
+            "ETag": etag,
+            "Cache-Control": "no-cache",  # Revalidate every time; a 304 is nearly free
+        }
+        if headers.get("if-none-match") == etag:
+            return 304, response_headers, b""
+        return 200, response_headers, body
+
+    def submit(self, body):
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise HttpError(400, "body must be JSON")
+        if not isinstance(data, dict):
+            raise HttpError(400, "body must be a JSON object")
+        player = data.get("player")
+        if not isinstance(player, str) or not 0 < len(player) <= MAX_PLAYER_LENGTH:
+            raise HttpError(400, f"player must be a name of 1 to {MAX_PLAYER_LENGTH} characters")
+        values = {}
+        for name in ("score", "hbd_coins", "hive_power"):
+            value = data.get(name, 0)
+            if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                raise HttpError(400, f"{name} must be a non-negative integer")
+            values[name] = value
+        duration = data.get("duration", 0.0)
+        if (not isinstance(duration, (int, float)) or isinstance(duration, bool)
+                or not math.isfinite(duration) or duration < 0):
+            raise HttpError(400, "duration must be a finite non-negative number")
+        seed = data.get("seed")
+        if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+            raise HttpError(400, "seed must be an integer")
+        record = self.store.submit(values["score"], values["hbd_coins"], values["hive_power"],
+                                   float(duration), seed, player)
+        return self._json(201, record)
+
+
+async def serve(host, port, store, root="."):
+    server = LeaderboardServer(store, root)
+    listener = await asyncio.start_server(server.handle_connection, host, port, limit=MAX_HEADER_BYTES)
+    addresses = ", ".join(str(sock.getsockname()) for sock in listener.sockets)
+    print(f"Serving pages and leaderboard on {addresses}")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the web pages and the Dino Puku leaderboard API.")
+    parser.add_argument("--host", default="0.0.0.0", help="interface to listen on")
+    parser.add_argument("--port", type=int, default=5001, help="port to listen on")
+    parser.add_argument("--scores-dir", default=LEADERBOARD_DIR, help="score log directory")
+    parser.add_argument("--root", default=os.path.dirname(os.path.abspath(__file__)), help="directory with the pages")
+    args = parser.parse_args()
+
+    store = ScoreStore(args.scores_dir)
+    try:
+        asyncio.run(serve(args.host, args.port, store, args.root))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
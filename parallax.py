@@ -0,0 +1,77 @@
+"""
+Parallax - Scrolling background layers drawn from pre-rendered tiled strips
+Each layer image is tiled once into a display-format strip one tile wider than
+the view, so any integer scroll offset is a single blit of exactly the visible
+columns (instead of two full blits of the image). Layers scroll at their own
+fraction of the game speed and are drawn back to front; `visible` limits how
+many are drawn, down to none (a flat color) on slow machines
+"""
+import pygame
+
+from sprite_atlas import copy_blit
+
+# Color de fondo cuando no se dibuja ninguna capa
+FLAT_COLOR = (135, 206, 235)
+
+
+class ParallaxLayer:
+    """One horizontally repeating image scrolling at `speed` times the game speed."""
+
+    def __init__(self, image, speed, y=0, view_width=None):
+        view_width = view_width or pygame.display.get_surface().get_width()
+        self.speed = speed
+        self.y = y
+        self.view_width = view_width
+        self.tile_width, self.height = image.get_size()
+        self.offset = 0.0  # Columna del tile que aparece en el borde izquierdo
+
+        # Tile the image across view + one tile; any offset in [0, tile_width) then fits in the strip
+        has_alpha = bool(image.get_flags() & pygame.SRCALPHA)
+        tiles = -(-view_width // self.tile_width) + 1
+        strip = pygame.Surface((self.tile_width * tiles, self.height), pygame.SRCALPHA if has_alpha else 0)
+        for i in range(tiles):
+            copy_blit(strip, image, (i * self.tile_width, 0))
+        self.strip = strip.convert_alpha() if has_alpha else strip.convert()
+
+    @property
+    def position(self):
+        """Integer offset actually drawn."""
+        return int(self.offset)
+
+    def scroll(self, game_speed):
+        self.offset = (self.offset + game_speed * self.speed) % self.tile_width
+
+    def draw(self, surface):
+        return surface.blit(self.strip, (0, self.y), (int(self.offset), 0, self.view_width, self.height))
+
+
+class Parallax:
+    """Back-to-front stack of layers; draw() reports whether any layer moved since the last draw."""
+
+    def __init__(self, layers):
+        self.layers = layers
+        self.visible = None  # Layers drawn, back first (None = all)
+        self._drawn = None
+
+    def reset(self):
+        for layer in self.layers:
+            layer.offset = 0.0
+
+    def scroll(self, game_speed):
+        for layer in self.layers:
+            layer.scroll(game_speed)
+
+    @property
+    def moved(self):
+        return self._positions() != self._drawn
+
+    def _positions(self):
+        return [layer.position for layer in self.layers[:self.visible]]
+
+    def draw(self, surface):
+        layers = self.layers[:self.visible]
+        if not layers:
+            surface.fill(FLAT_COLOR)
+        for layer in layers:
+            layer.draw(surface)
+        self._drawn = self._positions()
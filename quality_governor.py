@@ -0,0 +1,86 @@
+"""
+Quality Governor - Steps presentation quality down and up to hold a frame-time budget
+The game reports how long each frame took to build (without the frame limiter
+wait). Every WINDOW_FRAMES frames the governor looks at the p90 of that window:
+over budget it drops one quality tier, comfortably under it for UPGRADE_WINDOWS
+windows in a row it goes back up one. Tiers only change what is drawn or played
+(background layers, airplane banners, sound effects, HUD refresh rate); the
+simulation never sees them, so gameplay and replays are the same on every machine
+"""
+from frame_profiler import percentile
+
+# Best first. parallax_layers: background layers drawn (None = all, 0 = flat color);
+# hud_every: frames between HUD counter updates
+QUALITY_TIERS = [
+    {"name": "high", "parallax_layers": None, "airplanes": True, "sound_effects": True, "hud_every": 1},
+    {"name": "medium", "parallax_layers": None, "airplanes": True, "sound_effects": True, "hud_every": 2},
+    {"name": "low", "parallax_layers": 1, "airplanes": False, "sound_effects": True, "hud_every": 6},
+    {"name": "minimal", "parallax_layers": 0, "airplanes": False, "sound_effects": False, "hud_every": 12},
+]
+
+# Frames per decision (one second at 60 fps)
+WINDOW_FRAMES = 60
+
+# p90 below this fraction of the budget counts as headroom
+HEADROOM = 0.6
+
+# Windows of headroom in a row before stepping back up, so a tier doesn't flap
+UPGRADE_WINDOWS = 3
+
+
+def tier_index(name):
+    for index, tier in enumerate(QUALITY_TIERS):
+        if tier["name"] == name:
+            return index
+    raise ValueError(f"unknown quality tier {name!r}, expected one of {', '.join(t['name'] for t in QUALITY_TIERS)}")
+
+
+class QualityGovernor:
+    """Current quality tier, adjusted from the frame times passed to record()."""
+
+    def __init__(self, budget_ms, start="high", adaptive=True):
+        self.budget = budget_ms / 1000.0
+        self.index = tier_index(start)
+        self.adaptive = adaptive
+        self.changes = 0
+        self._samples = []
+        self._headroom_windows = 0
+
+    @property
+    def tier(self):
+        return QUALITY_TIERS[self.index]
+
+    def record(self, frame_seconds):
+        """Add one frame's work time; returns True when the tier changed."""
+        if not self.adaptive:
+            return False
+        self._samples.append(frame_seconds)
+        if len(self._samples) < WINDOW_FRAMES:
+            return False
+        p90 = percentile(sorted(self._samples), 0.90)
+        self._samples.clear()
+
+        if p90 > self.budget and self.index < len(QUALITY_TIERS) - 1:
+            self._headroom_windows = 0
+            return self._step(+1, f"p90 frame {p90 * 1000:.1f} ms > {self.budget * 1000:.1f} ms budget")
+        if p90 < self.budget * HEADROOM and self.index > 0:
+            self._headroom_windows += 1
+            if self._headroom_windows >= UPGRADE_WINDOWS:
+                self._headroom_windows = 0
+                return self._step(-1, f"p90 frame {p90 * 1000:.1f} ms < {self.budget * HEADROOM * 1000:.1f} ms "
+                                      f"for {UPGRADE_WINDOWS * WINDOW_FRAMES} frames")
+        else:
+            self._headroom_windows = 0
+        return False
+
+    def reset(self):
+        """Forget the frames measured so far (e.g. after a menu, whose frames aren't representative)."""
+        self._samples.clear()
+        self._headroom_windows = 0
+
+    def _step(self, direction, reason):
+        previous = self.tier["name"]
+        self.index += direction
+        self.changes += 1
+        print(f"Quality {previous} -> {self.tier['name']} ({reason})")
+        return True
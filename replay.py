@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Replay - Records the key presses of a game and plays them back headlessly
+A recording holds the seed and simulation settings plus every handled
+KEYDOWN/KEYUP with the tick it was applied before; GameSimulation is
+deterministic for a seed, so feeding the keys back at the same ticks reproduces
+the game exactly. Replays run without a window and as fast as the CPU allows,
+and check the final score, HBD coins and HivePower against the recording
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from game_simulation import GameSimulation
+
+FORMAT_VERSION = 2
+
+# Teclas de juego y sus nombres en las grabaciones
+KEY_NAMES = {pygame.K_SPACE: "space", pygame.K_UP: "up", pygame.K_DOWN: "down"}
+KEY_CODES = {name: key for key, name in KEY_NAMES.items()}
+
+# Final values a replay must reproduce
+CHECKED = ("frames", "score", "hbd_coins", "hive_power")
+
+
+def handle_key(character, event_type, key):
+    """Apply a game key to the character; returns False for keys the game ignores."""
+    if event_type == pygame.KEYDOWN:
+        if key == pygame.K_SPACE or key == pygame.K_UP:
+            character.jump()
+        elif key == pygame.K_DOWN:
+            character.duck(True)
+        else:
+            return False
+    elif event_type == pygame.KEYUP and key == pygame.K_DOWN:
+        character.duck(False)
+    else:
+        return False
+    return True
+
+
+class InputRecorder:
+    """Collects the key events of one game; save() writes them as JSON."""
+
+    def __init__(self, sim):
+        self.sim = sim
+        self.inputs = []  # [tick, "down" | "up", key name]
+
+    def record(self, event_type, key):
+        self.inputs.append([self.sim.frame, "down" if event_type == pygame.KEYDOWN else "up", KEY_NAMES[key]])
+
+    def recording(self):
+        sim = self.sim
+        return {
+            "version": FORMAT_VERSION,
+            "seed": sim.seed,
+            "difficulty": sim.difficulty,
+            "coin_rain": sim.coin_rain,
+            "sizes": {name: list(size) for name, size in sim.sizes.items()},
+            "inputs": self.inputs,
+            "result": {"frames": sim.frame, "score": sim.score, "hbd_coins": sim.hbd_coins,
+                       "hive_power": sim.hive_power},
+        }
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.recording(), f)
+        print(f"Replay saved to: {path}")
+
+
+def load_recording(path):
+    with open(path, "r", encoding="utf-8") as f:
+        recording = json.load(f)
+    if recording.get("version") != FORMAT_VERSION:
+        raise ValueError(f"'{path}' has replay version {recording.get('version')}, expected {FORMAT_VERSION}")
+    return recording
+
+
+def replay(recording, max_frames=None):
+    """Play `recording` back and return the final values as a dict like its "result"."""
+    sizes = {name: tuple(size) for name, size in recording["sizes"].items()}
+    sim = GameSimulation(seed=recording["seed"], sizes=sizes,
+                         difficulty=recording["difficulty"], coin_rain=recording["coin_rain"])
+    if max_frames is None:
+        max_frames = recording["result"]["frames"]
+    inputs = recording["inputs"]
+    character = sim.character
+    index = 0
+    while sim.frame < max_frames:
+        while index < len(inputs) and inputs[index][0] <= sim.frame:
+            _, kind, name = inputs[index]
+            handle_key(character, pygame.KEYDOWN if kind == "down" else pygame.KEYUP, KEY_CODES[name])
+            index += 1
+        running = sim.step()
+        sim.events.clear()
+        if not running:
+            break
+    return {"frames": sim.frame, "score": sim.score, "hbd_coins": sim.hbd_coins, "hive_power": sim.hive_power}
+
+
+def verify(recording):
+    """(name, recorded, replayed) for every final value the replay didn't reproduce."""
+    result = replay(recording)
+    expected = recording["result"]
+    return [(name, expected[name], result[name]) for name in CHECKED if expected[name] != result[name]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded Dino Puku games headlessly and check their results.")
+    parser.add_argument("replays", nargs="+", help="replay files written by the game (RECORD_REPLAYS)")
+    args = parser.parse_args()
+
+    failures = 0
+    for path in args.replays:
+        try:
+            recording = load_recording(path)
+        except (OSError, ValueError) as e:
+            print(f"{path}: ERROR {e}")
+            failures += 1
+            continue
+        start = time.perf_counter()
+        mismatches = verify(recording)
+        elapsed = time.perf_counter() - start
+        frames = recording["result"]["frames"]
+        status = "OK" if not mismatches else "MISMATCH"
+        print(f"{path}: {status} seed={recording['seed']} frames={frames} score={recording['result']['score']} "
+              f"({frames / max(elapsed, 1e-9):.0f} frames/s, {frames / 60 / max(elapsed, 1e-9):.0f}x real time)")
+        for name, expected, actual in mismatches:
+            print(f"  {name}: recorded {expected}, replayed {actual}")
+        failures += bool(mismatches)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""
+Score Store - Durable game results: append-only JSON-lines log plus a compacted snapshot
+submit() only updates the in-memory indexes (top N and best per player) and
+queues the record; a background thread appends queued records to the current
+log segment in batches. Every COMPACT_EVERY records the same thread folds the
+indexes into snapshot.json and starts a new segment, so startup reads one small
+snapshot and at most one short segment, however many games were recorded.
+
+Segments are numbered; the snapshot names the first segment it doesn't cover,
+so a crash at any point of a compaction neither loses nor double counts games.
+The snapshot is built from a second index of written records only, so records
+still queued never push a written one out of it
+"""
+import heapq
+import json
+import os
+import queue
+import threading
+import time
+
+# Where the log segments and snapshot live
+SCORES_DIR = "scores"
+
+# Size of the in-memory (and snapshot) leaderboard
+TOP_N = 100
+
+# Records per log segment before the writer compacts
+COMPACT_EVERY = 10000
+
+_STOP = object()
+_COMPACT = object()
+
+
+class ScoreStore:
+    """High scores of every game played, safe to submit() to from the game loop."""
+
+    def __init__(self, directory=SCORES_DIR, top_n=TOP_N, compact_every=COMPACT_EVERY):
+        self.directory = directory
+        self.top_n = top_n
+        self.compact_every = compact_every
+        self.games = 0  # Games ever recorded
+        self._top = []  # Min-heap of (score, -sequence, record), at most top_n long
+        self._best = {}  # player -> best record
+        # Same indexes over the records already on disk (writer thread only), for the snapshot
+        self._written_top = []
+        self._written_best = {}
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._segment = 0
+        self._segment_records = 0
+        self._written = 0  # Sequence number after the last record on disk
+
+        os.makedirs(directory, exist_ok=True)
+        start = time.perf_counter()
+        self._load()
+        print(f"Loaded {self.games} recorded games from '{directory}' in {(time.perf_counter() - start) * 1000:.1f} ms")
+        self._file = open(self._segment_path(self._segment), "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._write_loop, name="score-store", daemon=True)
+        self._thread.start()
+
+    # ----- Carga -----
+
+    def _segment_path(self, segment):
+        return os.path.join(self.directory, f"scores.{segment:06d}.jsonl")
+
+    def _segments(self):
+        segments = []
+        for name in os.listdir(self.directory):
+            if name.startswith("scores.") and name.endswith(".jsonl"):
+                try:
+                    segments.append(int(name[len("scores."):-len(".jsonl")]))
+                except ValueError:
+                    pass
+        return sorted(segments)
+
+    def _load(self):
+        snapshot_path = os.path.join(self.directory, "snapshot.json")
+        first_segment = 0
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            first_segment = snapshot["next_segment"]
+            self.games = snapshot["games"]
+            for record in snapshot["top"]:
+                self._index(self._top, self._best, record)
+            self._best = snapshot["best"]
+
+        self._segment = first_segment
+        for segment in self._segments():
+            path = self._segment_path(segment)
+            if segment < first_segment:
+                # Already folded into the snapshot by a compaction that didn't get to delete it
+                os.remove(path)
+                continue
+            self._segment = segment
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Línea cortada por un cierre inesperado
+                    self._add(record)
+                    self._segment_records += 1
+        self._written = self.games
+        self._written_top = list(self._top)
+        self._written_best = dict(self._best)
+
+    # ----- Índices en memoria -----
+
+    def _index(self, top, best, record):
+        """Add `record` to a top-N heap and a best-per-player dict."""
+        entry = (record["score"], -record["sequence"], record)
+        if len(top) < self.top_n:
+            heapq.heappush(top, entry)
+        elif entry > top[0]:
+            heapq.heapreplace(top, entry)
+        player = record.get("player")
+        if player is not None:
+            previous = best.get(player)
+            if previous is None or record["score"] > previous["score"]:
+                best[player] = record
+
+    def _add(self, record):
+        self.games = max(self.games, record["sequence"] + 1)
+        self._index(self._top, self._best, record)
+
+    def submit(self, score, hbd_coins=0, hive_power=0, duration=0.0, seed=None, player=None):
+        """Record one game; returns the record. Never blocks on disk."""
+        with self._lock:
+            record = {
+                "sequence": self.games,
+                "time": round(time.time(), 3),
+                "player": player,
+                "score": score,
+                "hbd_coins": hbd_coins,
+                "hive_power": hive_power,
+                "duration": round(duration, 3),
+                "seed": seed,
+            }
+            self._add(record)
+            # Queued under the lock, so the log is always in sequence order
+            self._queue.put(record)
+        return record
+
+    def top(self, n=None):
+        """The best `n` games (default all kept), highest score first, earlier game first on ties."""
+        with self._lock:
+            ranked = sorted(self._top, reverse=True)
+        return [record for _, _, record in ranked[:n]]
+
+    def best(self, player):
+        with self._lock:
+            return self._best.get(player)
+
+    @property
+    def high_score(self):
+        with self._lock:
+            return max(self._top)[0] if self._top else 0
+
+    # ----- Escritura en segundo plano -----
+
+    def _write_loop(self):
+        while True:
+            items = [self._queue.get()]
+            # Everything queued meanwhile goes out in the same write
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = _STOP in items
+            try:
+                self._write(items, stop)
+            except Exception as e:
+                # Keep the thread alive: the scores stay in memory and flush()/close() don't hang
+                print(f"Error writing scores to '{self.directory}': {e}")
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+            if stop:
+                self._file.close()
+                return
+
+    def _write(self, items, stop):
+        records = [item for item in items if isinstance(item, dict)]
+        lines = [json.dumps(record) + "\n" for record in records]
+        if lines:
+            self._file.write("".join(lines))
+            self._file.flush()
+            self._segment_records += len(lines)
+            self._written = records[-1]["sequence"] + 1
+            for record in records:
+                self._index(self._written_top, self._written_best, record)
+        if _COMPACT in items or self._segment_records >= self.compact_every or stop:
+            if self._segment_records:
+                self._compact()
+
+    def _compact(self):
+        """Fold everything written so far into the snapshot and start a new segment (writer thread only)."""
+        os.fsync(self._file.fileno())
+        self._file.close()
+        old_segment = self._segment
+        self._segment += 1
+        self._segment_records = 0
+        self._file = open(self._segment_path(self._segment), "a", encoding="utf-8")
+
+        # Records still queued will be written to the new segment, so the snapshot only
+        # covers the written ones, from their own indexes
+        snapshot = {
+            "next_segment": self._segment,
+            "games": self._written,
+            "top": [record for _, _, record in self._written_top],
+            "best": self._written_best,
+        }
+        snapshot_path = os.path.join(self.directory, "snapshot.json")
+        with open(snapshot_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(snapshot_path + ".tmp", snapshot_path)
+        for segment in self._segments():
+            if segment <= old_segment:
+                os.remove(self._segment_path(segment))
+
+    def compact(self):
+        """Ask the writer thread to compact now."""
+        self._queue.put(_COMPACT)
+
+    def flush(self):
+        """Block until every submitted record is on disk."""
+        self._queue.join()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Simulation Farm - Thousands of seeded headless games across every CPU core
+Seeds are split into chunks played by a process pool; each game is played by a
+bot policy from headless_runner.POLICIES. Tuning constants (GAME_SPEED,
+JUMP_STRENGTH, spawn intervals...) can be overridden for the whole run, and the
+results are aggregated into one report of score distribution, survival time and
+coin pickup rates
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import game_simulation
+import spawn_schedule
+from difficulty import PROFILES
+from frame_profiler import percentile
+from game_simulation import ASSET_DIR, ATLAS_SPRITES, TICK_RATE, GameSimulation, sprite_sizes
+from headless_runner import POLICIES, make_policy, play_game
+from sprite_atlas import load_masks
+
+# Constants --set may override: the module that reads them and the number type they take.
+# Tick counts are ints (they go to rng.randint); (low, high) constants take "low,high"
+TUNABLE = {
+    "GAME_SPEED": (game_simulation, float),
+    "JUMP_STRENGTH": (game_simulation, float),
+    "GRAVITY": (game_simulation, float),
+    "OBSTACLE_INTERVAL": (spawn_schedule, int),
+    "COIN_INTERVAL": (spawn_schedule, int),
+    "AIRPLANE_INTERVAL": (spawn_schedule, int),
+    "SPECIAL_COIN_COOLDOWN": (spawn_schedule, int),
+    "SPECIAL_COIN_CHANCE": (spawn_schedule, float),
+}
+
+# Seeds per task; large enough that pickling results is noise next to playing them
+CHUNK_SIZE = 50
+
+
+def _parse_number(text, number_type):
+    # Whole numbers stay ints even for float constants, so "GAME_SPEED=5" plays exactly like the default
+    try:
+        return int(text)
+    except ValueError:
+        if number_type is int:
+            raise
+        return float(text)
+
+
+def parse_override(text):
+    """"NAME=value" -> (NAME, value); ranges are written "60,120"."""
+    name, _, value = text.partition("=")
+    if name not in TUNABLE or not value:
+        raise argparse.ArgumentTypeError(f"expected NAME=value with NAME one of {', '.join(TUNABLE)}")
+    module, number_type = TUNABLE[name]
+    is_range = isinstance(getattr(module, name), tuple)
+    parts = value.split(",")
+    if len(parts) != (2 if is_range else 1):
+        raise argparse.ArgumentTypeError(f"{name} takes {'a range low,high' if is_range else 'a single value'}")
+    try:
+        numbers = tuple(_parse_number(part, number_type) for part in parts)
+    except ValueError:
+        kind = "integers" if number_type is int else "numbers"
+        raise argparse.ArgumentTypeError(f"{name} takes {kind}, got {value!r}")
+    return name, numbers if is_range else numbers[0]
+
+
+def apply_overrides(overrides):
+    for name, value in overrides.items():
+        setattr(TUNABLE[name][0], name, value)
+
+
+def _play_chunk(task):
+    seeds, policy_spec, max_frames, difficulty, overrides = task
+    # Workers may be forked or spawned; either way the overrides are applied here
+    apply_overrides(overrides)
+    policy = make_policy(policy_spec)
+    sim = GameSimulation(sizes=sprite_sizes(), difficulty=difficulty)
+    return [play_game(sim, seed, policy, max_frames) for seed in seeds]
+
+
+def run_farm(games, first_seed=0, policy="jump_when_near", max_frames=36000, difficulty="classic",
+             overrides=None, workers=None):
+    """Play `games` consecutive seeds on a process pool; returns the per-game results in seed order."""
+    overrides = dict(overrides or {})
+    make_policy(policy)  # Fail on a bad spec before starting any process
+    seeds = list(range(first_seed, first_seed + games))
+    tasks = [(seeds[i:i + CHUNK_SIZE], policy, max_frames, difficulty, overrides)
+             for i in range(0, len(seeds), CHUNK_SIZE)]
+    # Collision masks are built once here: forked workers inherit them, spawned ones read the
+    # atlas this leaves in the sprite cache instead of all decoding the source PNGs at once
+    load_masks(ATLAS_SPRITES, ASSET_DIR)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [result for chunk in executor.map(_play_chunk, tasks) for result in chunk]
+
+
+def _distribution(values):
+    ordered = sorted(values)
+    count = len(ordered)
+    return {
+        "mean": sum(ordered) / count if count else 0.0,
+        "min": ordered[0] if count else 0,
+        "p10": percentile(ordered, 0.10),
+        "p50": percentile(ordered, 0.50),
+        "p90": percentile(ordered, 0.90),
+        "max": ordered[-1] if count else 0,
+    }
+
+
+def aggregate(results):
+    """One report over every game: distributions plus pickup rates per minute survived."""
+    minutes = sum(result["frames"] for result in results) / TICK_RATE / 60
+    return {
+        "games": len(results),
+        "crash_rate": sum(result["crashed"] for result in results) / max(len(results), 1),
+        "score": _distribution([result["score"] for result in results]),
+        "survival_seconds": _distribution([result["frames"] / TICK_RATE for result in results]),
+        "hbd_coins": _distribution([result["hbd_coins"] for result in results]),
+        "hive_power": _distribution([result["hive_power"] for result in results]),
+        "hbd_coins_per_minute": sum(result["hbd_coins"] for result in results) / max(minutes, 1e-9),
+        "hive_power_per_minute": sum(result["hive_power"] for result in results) / max(minutes, 1e-9),
+    }
+
+
+def print_report(report):
+    print(f"{report['games']} games, crash rate {report['crash_rate']:.1%}")
+    print(f"  {'':<18} {'mean':>9} {'min':>9} {'p10':>9} {'p50':>9} {'p90':>9} {'max':>9}")
+    for name in ("score", "survival_seconds", "hbd_coins", "hive_power"):
+        row = report[name]
+        print(f"  {name:<18} " + " ".join(f"{row[key]:9.1f}" for key in ("mean", "min", "p10", "p50", "p90", "max")))
+    print(f"  HBD coins per minute: {report['hbd_coins_per_minute']:.2f}, "
+          f"HivePower per minute: {report['hive_power_per_minute']:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play seeded Dino Puku games on every CPU core and aggregate the results.")
+    parser.add_argument("-n", "--games", type=int, default=1000, help="number of games to play")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--policy", default="jump_when_near",
+                        help=f"bot playing the games, \"name\" or \"name:value\" ({', '.join(POLICIES)})")
+    parser.add_argument("--max-frames", type=int, default=36000, help="frame cap per game (60 per second)")
+    parser.add_argument("--difficulty", default="classic", choices=PROFILES, help="difficulty profile")
+    parser.add_argument("--set", dest="overrides", action="append", type=parse_override, default=[],
+                        metavar="NAME=VALUE", help=f"override a tuning constant ({', '.join(TUNABLE)})")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("-o", "--output", help="also save the report as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run_farm(args.games, args.seed, args.policy, args.max_frames, args.difficulty,
+                       dict(args.overrides), args.workers)
+    elapsed = time.perf_counter() - start
+
+    report = aggregate(results)
+    report["policy"] = args.policy
+    report["difficulty"] = args.difficulty
+    report["overrides"] = dict(args.overrides)
+    print_report(report)
+    total_frames = sum(result["frames"] for result in results)
+    print(f"{total_frames} frames in {elapsed:.2f}s ({total_frames / max(elapsed, 1e-9):.0f} frames/s)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
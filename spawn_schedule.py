@@ -0,0 +1,75 @@
+"""
+Spawn Schedule - Seeded, lazily generated spawn times for every entity type
+Each stream draws its interval once per spawn (uniform over the intended range)
+instead of re-drawing a threshold every tick, and has its own RNG derived from
+the game seed, so a seed reproduces the whole run. Intervals and the special
+coin chance come from a DifficultyCurve at the tick of each draw
+"""
+import random
+
+# Base ticks between spawns (inclusive ranges at 60 ticks per second), scaled by the difficulty profile
+OBSTACLE_INTERVAL = (60, 120)  # Entre 1 y 2 segundos
+COIN_INTERVAL = (30, 90)  # Entre 0.5 y 1.5 segundos
+AIRPLANE_INTERVAL = (200, 400)
+
+# Special coins: only after this many ticks without one, then with this (base) chance
+SPECIAL_COIN_COOLDOWN = 600  # Al menos 10 segundos desde la última moneda especial
+SPECIAL_COIN_CHANCE = 0.2
+
+
+def _stream_rng(seed, name):
+    # String seeds are hashed deterministically, so every stream is reproducible on its own
+    return random.Random(None if seed is None else f"{seed}:{name}")
+
+
+class SpawnScheduler:
+    """Hands out the upcoming spawns of one game as lazy (tick, ...) streams."""
+
+    def __init__(self, seed, width, ground_height, difficulty):
+        self.difficulty = difficulty
+        self.width = width
+        self.ground_height = ground_height
+        self.reset(seed)
+
+    def reset(self, seed):
+        """Start the streams of the game played with `seed`."""
+        self.seed = seed
+        # Plain functions rather than methods: a generator holding self would be a reference
+        # cycle, and every reset() would leave the previous streams for the cycle collector
+        self.obstacles = _obstacles(_stream_rng(seed, "obstacles"), self.difficulty, self.width)
+        self.coins = _coins(_stream_rng(seed, "coins"), self.difficulty, self.width, self.ground_height)
+        self.airplanes = _airplanes(_stream_rng(seed, "airplanes"), self.width)
+
+
+def _obstacles(rng, difficulty, width):
+    """Yields (tick, x, image_idx)."""
+    tick = 0
+    while True:
+        tick += rng.randint(*difficulty.obstacle_interval_at(tick))
+        yield tick, width + rng.randint(50, 150), rng.randint(0, 5)
+
+
+def _coins(rng, difficulty, width, ground_height):
+    """Yields (tick, x, y, special)."""
+    tick = 0
+    last_special = 1
+    while True:
+        tick += rng.randint(*difficulty.coin_interval_at(tick))
+        x = width + rng.randint(20, 100)
+        y = rng.randint(ground_height - 100, ground_height - 40)  # Altura variable
+
+        # Decidir si es una moneda especial (más rara)
+        special = False
+        if tick - last_special > SPECIAL_COIN_COOLDOWN:
+            special = rng.random() < difficulty.special_coin_chance_at(tick)
+            if special:
+                last_special = tick
+        yield tick, x, y, special
+
+
+def _airplanes(rng, width):
+    """Yields (tick, x, y)."""
+    tick = 0
+    while True:
+        tick += rng.randint(*AIRPLANE_INTERVAL)
+        yield tick, width + 100, rng.randint(50, 150)  # Altura aleatoria pero por la parte superior
@@ -0,0 +1,202 @@
+"""
+Sprite Atlas - Packs the game sprites into one pre-scaled, display-format surface
+The scaled atlas is cached on disk, keyed by source mtimes and target sizes,
+so warm starts skip decoding and re-scaling the original (very large) PNGs.
+Per-sprite collision masks are built once from the atlas and kept with it
+"""
+import hashlib
+import json
+import os
+
+import pygame
+
+# Directory where packed atlases are cached (DINO_SPRITE_CACHE overrides it, e.g. for cold-start benchmarks)
+CACHE_DIR = os.environ.get("DINO_SPRITE_CACHE", ".sprite_cache")
+
+# Width of the packed atlas; every row is filled left to right
+ATLAS_WIDTH = 1024
+
+# Spacing between packed sprites so scaled edges never bleed into each other
+PADDING = 1
+
+# Alpha above which a pixel counts as solid in the collision masks
+MASK_THRESHOLD = 127
+
+# Masks built by load_masks(), by atlas cache key (once per process)
+_MASKS = {}
+
+
+def scaled_size(original_size, target_height):
+    """(width, height) of an image scaled to `target_height` with its aspect ratio kept.
+
+    The one formula every loader uses, so atlas, bundle, loose images and the
+    simulation's sprite sizes agree to the pixel.
+    """
+    original_width, original_height = original_size
+    scale_factor = target_height / original_height
+    return int(original_width * scale_factor), target_height
+
+
+def copy_blit(destination, source, position):
+    """Copy `source` into a cleared (zero-filled) area of `destination`, alpha included.
+
+    A normal blit blends per-pixel alpha onto what is below, which darkens
+    semi-transparent edges on a transparent surface. With BLEND_RGBA_MAX onto zeros
+    every channel, alpha included, comes out exactly as in `source`. Destinations
+    without per-pixel alpha just get a plain blit.
+    """
+    if destination.get_flags() & pygame.SRCALPHA:
+        return destination.blit(source, position, special_flags=pygame.BLEND_RGBA_MAX)
+    return destination.blit(source, position)
+
+
+def _cache_key(sprites, asset_dir):
+    """Hash of every source file's mtime and size plus its requested target height."""
+    entries = []
+    for name, (file_name, target_height) in sorted(sprites.items()):
+        path = os.path.join(asset_dir, file_name)
+        try:
+            stat = os.stat(path)
+            source = [stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            source = None
+        entries.append([name, file_name, target_height, source])
+    payload = json.dumps([ATLAS_WIDTH, PADDING, entries]).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()[:16]
+
+
+def _build_masks(surface, rects):
+    return {name: pygame.mask.from_surface(surface.subsurface(rect), MASK_THRESHOLD) for name, rect in rects.items()}
+
+
+def load_masks(sprites, asset_dir, cache_dir=CACHE_DIR):
+    """Collision masks of the atlas for `sprites`, for code that never displays it (headless games).
+
+    Built from the same cached atlas the game draws with, so both agree pixel for pixel.
+    On a cold cache this decodes and scales every source PNG first (about 2 s); after
+    that it only reads the small cached atlas, and later calls in the process are free.
+    """
+    key = _cache_key(sprites, asset_dir)
+    masks = _MASKS.get(key)
+    if masks is None:
+        surface, rects = SpriteAtlas.load_raw(sprites, asset_dir, cache_dir)
+        masks = _MASKS[key] = _build_masks(surface, rects)
+    return masks
+
+
+def _pack(sizes):
+    """Shelf-pack (width, height) boxes into rows of ATLAS_WIDTH; returns rects and total height."""
+    rects = {}
+    x = y = row_height = 0
+    # Tallest first keeps rows tight
+    for name, (width, height) in sorted(sizes.items(), key=lambda item: -item[1][1]):
+        if x + width > ATLAS_WIDTH and x > 0:
+            x = 0
+            y += row_height + PADDING
+            row_height = 0
+        rects[name] = (x, y, width, height)
+        x += width + PADDING
+        row_height = max(row_height, height)
+    return rects, y + row_height
+
+
+class SpriteAtlas:
+    """One display-format surface holding every sprite; sprites are handed out as subsurfaces."""
+
+    def __init__(self, surface, rects):
+        self.surface = surface
+        self.rects = rects
+        self._sprites = {name: surface.subsurface(rect) for name, rect in rects.items()}
+        self._masks = None
+
+    def __getitem__(self, name):
+        return self._sprites[name]
+
+    def __contains__(self, name):
+        return name in self._sprites
+
+    @property
+    def masks(self):
+        """{name: pygame.mask.Mask} of every sprite, built on first use."""
+        if self._masks is None:
+            self._masks = _build_masks(self.surface, self.rects)
+        return self._masks
+
+    @classmethod
+    def load(cls, sprites, asset_dir, cache_dir=CACHE_DIR):
+        """Load the atlas for `sprites` ({name: (file_name, target_height)}) from cache or build it.
+
+        Must be called after pygame.display.set_mode() so the atlas can be converted
+        to the display's pixel format.
+        """
+        return cls.from_raw(cls.load_raw(sprites, asset_dir, cache_dir))
+
+    @classmethod
+    def from_raw(cls, raw):
+        """Convert a load_raw() result to the display format (main thread only)."""
+        surface, rects = raw
+        return cls(surface.convert_alpha(), rects)
+
+    @classmethod
+    def load_raw(cls, sprites, asset_dir, cache_dir=CACHE_DIR):
+        """Cached or freshly built (surface, rects), not yet display-converted.
+
+        Doesn't touch the display, so it can run on a loader thread.
+        """
+        key = _cache_key(sprites, asset_dir)
+        image_path = os.path.join(cache_dir, f"atlas_{key}.png")
+        index_path = os.path.join(cache_dir, f"atlas_{key}.json")
+
+        if os.path.exists(image_path) and os.path.exists(index_path):
+            try:
+                with open(index_path, "r", encoding="utf-8") as f:
+                    rects = {name: tuple(rect) for name, rect in json.load(f).items()}
+                surface = pygame.image.load(image_path)
+                print(f"Loaded sprite atlas from cache: {image_path}")
+                return surface, rects
+            except (OSError, ValueError, pygame.error) as e:
+                print(f"Sprite atlas cache unreadable ({e}), rebuilding")
+
+        surface, rects = cls._build(sprites, asset_dir)
+        # Written under per-process names and renamed into place, so processes building the same
+        # atlas at once (sim_farm workers) never read or leave a half-written file
+        suffix = f".{os.getpid()}.tmp"
+        temp_image_path = image_path[:-len(".png")] + suffix + ".png"  # pygame picks the format by extension
+        temp_index_path = index_path + suffix
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            pygame.image.save(surface, temp_image_path)
+            with open(temp_index_path, "w", encoding="utf-8") as f:
+                json.dump(rects, f)
+            # Index first: a cached image always has its index next to it
+            os.replace(temp_index_path, index_path)
+            os.replace(temp_image_path, image_path)
+            print(f"Saved sprite atlas to cache: {image_path}")
+        except (OSError, pygame.error) as e:
+            print(f"Could not cache sprite atlas: {e}")
+            for path in (temp_image_path, temp_index_path):
+                if os.path.exists(path):
+                    os.remove(path)
+        return surface, rects
+
+    @staticmethod
+    def _build(sprites, asset_dir):
+        scaled = {}
+        for name, (file_name, target_height) in sprites.items():
+            full_path = os.path.join(asset_dir, file_name)
+            try:
+                print(f"Loading image from: {full_path}")
+                image = pygame.image.load(full_path)
+                scaled[name] = pygame.transform.scale(image, scaled_size(image.get_size(), target_height))
+            except (FileNotFoundError, pygame.error):
+                print(f"Error: No se encontró la imagen '{full_path}'.")
+                # Magenta placeholder, same as load_and_scale()
+                placeholder = pygame.Surface((50, target_height), pygame.SRCALPHA)
+                placeholder.fill((255, 0, 255))
+                scaled[name] = placeholder
+
+        rects, height = _pack({name: image.get_size() for name, image in scaled.items()})
+        surface = pygame.Surface((ATLAS_WIDTH, max(height, 1)), pygame.SRCALPHA)
+        for name, image in scaled.items():
+            copy_blit(surface, image, rects[name][:2])
+        return surface, rects